@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Date, Time, JSON
+from sqlalchemy import create_engine, event, func, inspect, literal, Index, Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Date, Time, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, column_property, query_expression
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from sqlalchemy.sql.functions import FunctionElement
+from contextvars import ContextVar
 from datetime import datetime
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
 
@@ -9,10 +15,84 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./paa.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Async drivers for the sync URLs we support (used by endpoints that fan out queries)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def _async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+# Connection pool sizing, shared by the sync and async engines. /chat fans out
+# several queries per request, so the default pool_size=5 saturates quickly.
+# A short pool_timeout makes an exhausted pool fail fast instead of queueing
+# requests for 30s.
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "5")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    "pool_pre_ping": True,
+}
+
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **POOL_SETTINGS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(_async_database_url(DATABASE_URL), **POOL_SETTINGS)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+# Per-request SQL statement counter. Holds a one-element list so increments made
+# in threadpool workers (sync endpoints) are visible to the request that set it.
+db_query_counter: ContextVar[Optional[List[int]]] = ContextVar("db_query_counter", default=None)
+
+@event.listens_for(engine, "before_cursor_execute")
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = db_query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+# SQLite ignores foreign keys (and their ON DELETE actions) unless enabled per connection
+@event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def get_db_query_count() -> Optional[int]:
+    """Number of SQL statements executed so far in the current request, if tracked"""
+    counter = db_query_counter.get()
+    return counter[0] if counter is not None else None
+
+def get_pool_status() -> dict:
+    """Checked-out vs. available connections for each engine (to spot pool saturation)"""
+    return {
+        name: {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checked_in": pool.checkedin(),
+        }
+        for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool))
+    }
+
+class day_number(FunctionElement):
+    """Integer day number of a DATE column, for consecutive-day (streak) arithmetic"""
+    type = Integer()
+    inherit_cache = True
+
+@compiles(day_number)
+def _day_number_default(element, compiler, **kw):
+    return "(%s - DATE '1970-01-01')" % compiler.process(element.clauses, **kw)
+
+@compiles(day_number, "sqlite")
+def _day_number_sqlite(element, compiler, **kw):
+    return "CAST(julianday(%s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
 class User(Base):
     __tablename__ = "users"
     
@@ -57,16 +137,20 @@ class HabitLog(Base):
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user_session", "user_id", "session_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    session_id = Column(String, nullable=False, index=True)  # UUID for session
+    session_id = Column(String, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False, index=True)  # UUID for session
     session_name = Column(String, nullable=False)  # User-friendly name
     message = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="conversations")
+    session = relationship("ChatSession", back_populates="conversations")
 
 class DailyCheckIn(Base):
     __tablename__ = "daily_checkins"
@@ -91,6 +175,11 @@ class Person(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # People lookups by name (chat actions) and the per-user people list
+        Index("ix_people_user_lower_name", user_id, func.lower(name)),
+    )
+    
     user = relationship("User", back_populates="people")
 
 class UserProfile(Base):
@@ -109,6 +198,14 @@ class UserProfile(Base):
 
 class Commitment(Base):
     __tablename__ = "commitments"
+    __table_args__ = (
+        # List endpoints filter by user, then by status/type or sort by date
+        Index("ix_commitments_user_status_recurrence", "user_id", "status", "recurrence_pattern"),
+        Index("ix_commitments_user_deadline", "user_id", "deadline"),
+        Index("ix_commitments_user_created", "user_id", "created_at"),
+        # The reminder scheduler scans pending commitments past their deadline across all users
+        Index("ix_commitments_status_deadline", "status", "deadline"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -116,7 +213,7 @@ class Commitment(Base):
     original_message = Column(Text)
     deadline = Column(Date)
     status = Column(String, default="pending")  # pending, completed, missed, dismissed
-    created_from_conversation_id = Column(Integer, ForeignKey("conversations.id"))
+    created_from_conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="SET NULL"))
     last_reminded_at = Column(DateTime)
     reminder_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -131,12 +228,24 @@ class Commitment(Base):
     last_completed_at = Column(DateTime)
     reminder_settings = Column(JSON)  # Flexible reminder configuration
     
+    # Computed in SQL: recurring unless the pattern is 'none' (NULL counts as recurring)
+    is_recurring = column_property(func.coalesce(recurrence_pattern, "") != "none")
+    # Filled per query via with_expression(); False unless a query asks for it
+    completed_today = query_expression(literal(False))
+    
     user = relationship("User", back_populates="commitments")
     conversation = relationship("Conversation")
     completions = relationship("CommitmentCompletion", back_populates="commitment", cascade="all, delete-orphan")
 
 class CommitmentCompletion(Base):
     __tablename__ = "commitment_completions"
+    __table_args__ = (
+        # One completion (or skip) per commitment per day; also serves the
+        # completion lookups that filter on a set of commitments for a given
+        # day or date range (analytics)
+        Index("uq_commitment_completions_commitment_date", "commitment_id", "completion_date", unique=True),
+        Index("ix_commitment_completions_user_date_skipped", "user_id", "completion_date", "skipped"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     commitment_id = Column(Integer, ForeignKey("commitments.id", ondelete="CASCADE"))
@@ -156,7 +265,7 @@ class ProactiveMessage(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     message_type = Column(String)  # commitment_reminder, scheduled_prompt, escalation
     content = Column(Text, nullable=False)
-    related_commitment_id = Column(Integer, ForeignKey("commitments.id"))
+    related_commitment_id = Column(Integer, ForeignKey("commitments.id", ondelete="SET NULL"))
     session_id = Column(String, nullable=True)  # Target session for the message
     scheduled_for = Column(DateTime)
     sent_at = Column(DateTime)
@@ -168,6 +277,10 @@ class ProactiveMessage(Base):
 
 class ScheduledPrompt(Base):
     __tablename__ = "scheduled_prompts"
+    __table_args__ = (
+        # The prompt scheduler looks up active prompts whose send window is open
+        Index("ix_scheduled_prompts_active_next_due", "is_active", "next_due_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -177,12 +290,16 @@ class ScheduledPrompt(Base):
     prompt_template = Column(Text, nullable=False)
     is_active = Column(Boolean, default=True)
     last_sent_at = Column(DateTime)
+    next_due_at = Column(DateTime)  # Next scheduled send, maintained by scheduler.schedule_next_prompt
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="scheduled_prompts")
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        Index("ix_chat_sessions_user_last_message", "user_id", "last_message_at"),
+    )
     
     id = Column(String, primary_key=True)  # UUID
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -193,9 +310,130 @@ class ChatSession(Base):
     
     # Relationships
     user = relationship("User", back_populates="chat_sessions")
+    # Conversations are removed by the ON DELETE CASCADE foreign key, not loaded and deleted by the ORM
+    conversations = relationship("Conversation", back_populates="session", passive_deletes=True)
+
+# Triggers keeping commitments.completion_count / last_completed_at in step with
+# commitment_completions, so writers only insert the completion row. Skipped
+# completions don't count. Keyed by dialect; each list is safe to re-run.
+COMPLETION_STATS_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_commitment_completions_insert
+        AFTER INSERT ON commitment_completions
+        WHEN NOT NEW.skipped
+        BEGIN
+            UPDATE commitments
+            SET completion_count = COALESCE(completion_count, 0) + 1,
+                last_completed_at = NEW.completed_at
+            WHERE id = NEW.commitment_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_commitment_completions_delete
+        AFTER DELETE ON commitment_completions
+        WHEN NOT OLD.skipped
+        BEGIN
+            UPDATE commitments
+            SET completion_count = MAX(COALESCE(completion_count, 0) - 1, 0)
+            WHERE id = OLD.commitment_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION commitment_completion_stats() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' AND NOT NEW.skipped THEN
+                UPDATE commitments
+                SET completion_count = COALESCE(completion_count, 0) + 1,
+                    last_completed_at = NEW.completed_at
+                WHERE id = NEW.commitment_id;
+            ELSIF TG_OP = 'DELETE' AND NOT OLD.skipped THEN
+                UPDATE commitments
+                SET completion_count = GREATEST(COALESCE(completion_count, 0) - 1, 0)
+                WHERE id = OLD.commitment_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS trg_commitment_completion_stats ON commitment_completions",
+        """
+        CREATE TRIGGER trg_commitment_completion_stats
+        AFTER INSERT OR DELETE ON commitment_completions
+        FOR EACH ROW EXECUTE FUNCTION commitment_completion_stats()
+        """,
+    ],
+}
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# ON DELETE actions for foreign keys of tables created before they were declared.
+# NOT VALID skips checking existing rows. SQLite can't alter constraints, so
+# databases created before then keep their old foreign keys until recreated.
+FOREIGN_KEY_MIGRATIONS = {
+    "postgresql": [
+        "ALTER TABLE conversations DROP CONSTRAINT IF EXISTS conversations_session_id_fkey",
+        """
+        ALTER TABLE conversations ADD CONSTRAINT conversations_session_id_fkey
+        FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE NOT VALID
+        """,
+        "ALTER TABLE commitments DROP CONSTRAINT IF EXISTS commitments_created_from_conversation_id_fkey",
+        """
+        ALTER TABLE commitments ADD CONSTRAINT commitments_created_from_conversation_id_fkey
+        FOREIGN KEY (created_from_conversation_id) REFERENCES conversations (id) ON DELETE SET NULL NOT VALID
+        """,
+        "ALTER TABLE proactive_messages DROP CONSTRAINT IF EXISTS proactive_messages_related_commitment_id_fkey",
+        """
+        ALTER TABLE proactive_messages ADD CONSTRAINT proactive_messages_related_commitment_id_fkey
+        FOREIGN KEY (related_commitment_id) REFERENCES commitments (id) ON DELETE SET NULL NOT VALID
+        """,
+    ],
+}
+
+# Completions repeated for the same commitment and day (the old check-then-insert
+# didn't prevent them) are removed, keeping the first, before the unique index
+# on (commitment_id, completion_date) is created
+DEDUPE_COMMITMENT_COMPLETIONS = """
+DELETE FROM commitment_completions
+WHERE commitment_id IS NOT NULL AND completion_date IS NOT NULL
+AND id NOT IN (
+    SELECT MIN(id) FROM commitment_completions
+    WHERE commitment_id IS NOT NULL AND completion_date IS NOT NULL
+    GROUP BY commitment_id, completion_date
+)
+"""
+
+def init_db():
+    """Create any missing tables, columns, indexes, foreign key actions and triggers (run once per deploy via scripts/init_db.py)"""
+    Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so add the (nullable) columns
+    # and the indexes introduced since
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ADD COLUMN {CreateColumn(column).compile(dialect=engine.dialect)}"
+                    )
+    completion_indexes = {index["name"] for index in inspector.get_indexes("commitment_completions")}
+    with engine.begin() as connection:
+        if "uq_commitment_completions_commitment_date" not in completion_indexes:
+            connection.exec_driver_sql(DEDUPE_COMMITMENT_COMPLETIONS)
+        # IF NOT EXISTS rather than checkfirst, which can't reflect expression indexes
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+        
+        for statement in FOREIGN_KEY_MIGRATIONS.get(connection.dialect.name, []):
+            connection.exec_driver_sql(statement)
+        for statement in COMPLETION_STATS_TRIGGERS.get(connection.dialect.name, []):
+            connection.exec_driver_sql(statement)
+
+# Schema creation is opt-in at import so worker start-up doesn't hit the database
+if os.getenv("PAA_INIT_SCHEMA") == "1":
+    init_db()
 
 # Dependency
 def get_db():
@@ -203,4 +441,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -7,7 +7,8 @@ import logging
 import os
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional
 from dataclasses import dataclass
 
 
@@ -37,6 +38,7 @@ class PipelineExecution:
     action_processing: Optional[Dict[str, Any]] = None
     vector_operations: Optional[Dict[str, Any]] = None
     total_duration: Optional[float] = None
+    db_queries: Optional[int] = None
     success: bool = True
     error: Optional[str] = None
 
@@ -44,6 +46,8 @@ class PipelineExecution:
 class DebugLogger:
     """Centralized debug logging system for PAA"""
     
+    MAX_RECENT_EXECUTIONS = 10
+    
     def __init__(self):
         self.debug_mode = os.getenv("DEBUG_MODE", "false").lower() == "true"
         self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -51,7 +55,7 @@ class DebugLogger:
         
         # Current pipeline execution tracking
         self.current_execution: Optional[PipelineExecution] = None
-        self.recent_executions: List[PipelineExecution] = []
+        self.recent_executions: Deque[PipelineExecution] = deque(maxlen=self.MAX_RECENT_EXECUTIONS)
         
         self.setup_logging()
         
@@ -128,7 +132,7 @@ class DebugLogger:
         
         return execution_id
     
-    def end_pipeline_execution(self, success: bool = True, error: Optional[str] = None):
+    def end_pipeline_execution(self, success: bool = True, error: Optional[str] = None, db_queries: Optional[int] = None):
         """End the current pipeline execution"""
         if self.current_execution:
             self.current_execution.total_duration = (
@@ -137,11 +141,10 @@ class DebugLogger:
             
             self.current_execution.success = success
             self.current_execution.error = error
+            self.current_execution.db_queries = db_queries
             
-            # Add to recent executions (keep last 10)
+            # Add to recent executions (deque drops the oldest past MAX_RECENT_EXECUTIONS)
             self.recent_executions.append(self.current_execution)
-            if len(self.recent_executions) > 10:
-                self.recent_executions = self.recent_executions[-10:]
             
             if self.debug_mode:
                 status = f"{ColorCodes.OKGREEN}✅ SUCCESS{ColorCodes.ENDC}" if success else f"{ColorCodes.FAIL}❌ FAILED{ColorCodes.ENDC}"
@@ -338,6 +341,7 @@ class DebugLogger:
                 'user_id': exec.user_id,
                 'message': exec.message[:100],
                 'duration': exec.total_duration,
+                'db_queries': exec.db_queries,
                 'success': exec.success,
                 'error': exec.error,
                 'stages': {
@@ -348,7 +352,7 @@ class DebugLogger:
                     'vector_operations': exec.vector_operations is not None
                 }
             }
-            for exec in self.recent_executions
+            for exec in list(self.recent_executions)
         ]
     
     def get_debug_status(self) -> Dict[str, Any]:
@@ -368,36 +372,41 @@ class DebugLogger:
             "recent_executions_count": len(self.recent_executions)
         }
     
-    # Standard logging methods for compatibility
-    def info(self, message: str):
+    # Standard logging methods for compatibility. Extra args are %-style and only
+    # interpolated when the message is actually printed or emitted.
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a message at this level would be printed or logged"""
+        return self.debug_mode or logging.getLogger().isEnabledFor(level)
+    
+    def info(self, message: str, *args):
         """Log info message"""
         if self.debug_mode:
-            print(f"{ColorCodes.OKBLUE}ℹ️  {message}{ColorCodes.ENDC}")
-        logging.info(message)
+            print(f"{ColorCodes.OKBLUE}ℹ️  {message % args if args else message}{ColorCodes.ENDC}")
+        logging.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
         if self.debug_mode:
-            print(f"{ColorCodes.WARNING}⚠️  {message}{ColorCodes.ENDC}")
-        logging.warning(message)
+            print(f"{ColorCodes.WARNING}⚠️  {message % args if args else message}{ColorCodes.ENDC}")
+        logging.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
         if self.debug_mode:
-            print(f"{ColorCodes.FAIL}❌ {message}{ColorCodes.ENDC}")
-        logging.error(message)
+            print(f"{ColorCodes.FAIL}❌ {message % args if args else message}{ColorCodes.ENDC}")
+        logging.error(message, *args)
         
         # Update current execution if active
         if self.current_execution:
             self.current_execution.success = False
             if not self.current_execution.error:
-                self.current_execution.error = message
+                self.current_execution.error = message % args if args else message
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message"""
         if self.debug_mode:
-            print(f"{ColorCodes.OKCYAN}🐛 {message}{ColorCodes.ENDC}")
-        logging.debug(message)
+            print(f"{ColorCodes.OKCYAN}🐛 {message % args if args else message}{ColorCodes.ENDC}")
+        logging.debug(message, *args)
 
 
 # Global debug logger instance
@@ -1,26 +1,37 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Callable, List, Optional
 from datetime import datetime, timedelta, date
-from sqlalchemy import func, and_, or_, cast, Date
+from sqlalchemy import func, and_, or_, cast, Date, insert, update, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
 from collections import defaultdict
 import os
+import re
+import base64
+import operator
+import asyncio
 import logging
 import time
 import uuid
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
-from database import get_db, engine, Base, SessionLocal
+from database import get_db, get_async_db, engine, Base, SessionLocal, AsyncSessionLocal, db_query_counter, get_db_query_count, get_pool_status, day_number
 from auth import (
     authenticate_user, create_access_token, get_current_user, 
     get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 import schemas
 import database as models
-from anthropic import Anthropic
-from scheduler import start_scheduler, stop_scheduler, initialize_default_prompts_for_user_sync
+from anthropic import AsyncAnthropic
+from scheduler import start_scheduler, stop_scheduler, initialize_default_prompts_for_user_sync, schedule_next_prompt
 from services.commitment_parser import commitment_parser
 from services.time_service import time_service
 from services.nlp_intent_classifier import nlp_intent_classifier
@@ -33,45 +44,109 @@ import atexit
 
 load_dotenv()
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Environment flags that don't change at runtime, resolved once at import
+_DEBUG_HTTP = os.getenv("DEBUG_HTTP_REQUESTS", "false").lower() == "true"
+_ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+_HAS_ANTHROPIC_KEY = bool(_ANTHROPIC_API_KEY)
 
-app = FastAPI(title="Personal AI Assistant API")
+app = FastAPI(title="Personal AI Assistant API", default_response_class=ORJSONResponse)
 
-# Debug middleware for HTTP request/response logging
-@app.middleware("http")
-async def debug_middleware(request: Request, call_next):
-    if debug_logger.debug_mode and os.getenv("DEBUG_HTTP_REQUESTS", "false").lower() == "true":
-        start_time = time.time()
+# Requests issuing more SQL statements than this get a warning (catches N+1
+# regressions). A normal chat message runs roughly 10-15, so stay well above that
+DB_QUERY_WARN_THRESHOLD = int(os.getenv("DB_QUERY_WARN_THRESHOLD", "25"))
+
+# Dialect INSERT constructs that support ON CONFLICT
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Per-process cache of /analytics/overview results: user_id -> (day, payload)
+OVERVIEW_CACHE_TTL = int(os.getenv("OVERVIEW_CACHE_TTL", "45"))
+_overview_cache = TTLCache(maxsize=10_000, ttl=OVERVIEW_CACHE_TTL)
+
+
+def _decode_headers(raw_headers) -> dict:
+    return {key.decode("latin-1"): value.decode("latin-1") for key, value in raw_headers}
+
+
+class QueryCounterMiddleware:
+    """Pure ASGI middleware counting SQL statements per request"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Log request
-        body = await request.body()
-        debug_logger.log_http_request(
-            method=request.method,
-            path=str(request.url.path),
-            headers=dict(request.headers),
-            body=body.decode() if body else None
-        )
+        counter = [0]
+        token = db_query_counter.set(counter)
         
-        # Process request (need to recreate request with body for downstream)
-        from fastapi import Request as FastAPIRequest
-        async def receive():
-            return {"type": "http.request", "body": body}
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and debug_logger.debug_mode:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(counter[0]).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
         
-        request = FastAPIRequest(request.scope, receive)
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            db_query_counter.reset(token)
         
-        # Log response
-        process_time = time.time() - start_time
-        debug_logger.log_http_response(
-            status_code=response.status_code,
-            process_time=process_time,
-            headers=dict(response.headers)
-        )
-    else:
-        response = await call_next(request)
+        if counter[0] > DB_QUERY_WARN_THRESHOLD:
+            # get_current_user leaves the authenticated user's id in request.state
+            debug_logger.warning(
+                "%s %s executed %d SQL statements (threshold %d, user %s)",
+                scope["method"], scope["path"], counter[0], DB_QUERY_WARN_THRESHOLD,
+                scope.get("state", {}).get("user_id", "-")
+            )
+
+
+class DebugMiddleware:
+    """Pure ASGI middleware for HTTP request/response logging.
+    
+    Request body chunks are only collected when HTTP debugging is enabled, and
+    the response body is never buffered.
+    """
+    
+    def __init__(self, app):
+        self.app = app
     
-    return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (debug_logger.debug_mode and _DEBUG_HTTP):
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        body_chunks = []
+        
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                body_chunks.append(message.get("body", b""))
+            return message
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                body = b"".join(body_chunks)
+                debug_logger.log_http_request(
+                    method=scope["method"],
+                    path=scope["path"],
+                    headers=_decode_headers(scope.get("headers", [])),
+                    body=body.decode(errors="replace") if body else None
+                )
+                debug_logger.log_http_response(
+                    status_code=message["status"],
+                    process_time=time.perf_counter() - start_time,
+                    headers=_decode_headers(message.get("headers", []))
+                )
+            await send(message)
+        
+        await self.app(scope, receive_wrapper, send_wrapper)
+
+
+app.add_middleware(QueryCounterMiddleware)
+app.add_middleware(DebugMiddleware)
 
 # CORS configuration - Allow all origins for development
 # In production, you should restrict this to specific origins
@@ -81,10 +156,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # pagination cursor for list endpoints
 )
 
+# Compress larger JSON payloads (analytics daily_data is highly repetitive)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Initialize Anthropic client
-anthropic_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY", ""))
+anthropic_client = AsyncAnthropic(api_key=_ANTHROPIC_API_KEY)
 
 # Initialize hybrid pipeline services
 rag_system = create_rag_system(lambda: SessionLocal())
@@ -107,6 +186,10 @@ async def shutdown_event():
 @app.on_event("startup")
 async def startup_event():
     """Initialize background scheduler when FastAPI starts"""
+    # Run tasks eagerly so coroutines that finish without suspending skip a
+    # loop iteration (Python 3.12+; older interpreters keep the default factory)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     await start_scheduler()
 
 @app.get("/")
@@ -122,11 +205,11 @@ def health_check():
 @app.post("/register", response_model=schemas.User)
 def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     # Check if user exists
-    db_user = db.query(models.User).filter(
+    existing_user_id = db.query(models.User.id).filter(
         (models.User.username == user.username) | 
         (models.User.email == user.email)
-    ).first()
-    if db_user:
+    ).limit(1).scalar()
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=400,
             detail="Username or email already registered"
@@ -134,14 +217,12 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
     
     # Create new user
     hashed_password = get_password_hash(user.password)
-    db_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password
+    db_user = _commit_returning(
+        db,
+        insert(models.User)
+        .values(username=user.username, email=user.email, hashed_password=hashed_password)
+        .returning(models.User)
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
     
     # Initialize default scheduled prompts for new user
     try:
@@ -175,45 +256,128 @@ def read_users_me(current_user: models.User = Depends(get_current_user)):
 
 
 
+# Reply keywords for commitment reminders, compiled into one alternation so a
+# message is scanned once; the named group tells which action matched. Matched
+# as whole words, with the verbs' inflections ("cancelled", "skipped",
+# "postponed", "delaying") spelled out
+_REPLY_ACTION_RE = re.compile(
+    r"\b(?:"
+    r"(?P<complete>done|completed|finished|yes|yep|yeah|did it|just did|already did)"
+    r"|(?P<dismiss>cancel\w*|dismiss\w*|nevermind|skip\w*|forget it|no longer|not doing)"
+    r"|(?P<postpone>tomorrow|later|postpone\w*|delay\w*|not today)"
+    r")\b"
+)
+
+
+# Demo-response topic keywords in one alternation so the fallback reply scans
+# the message once. Unlike the reply actions above, these are deliberately
+# matched as substrings, so "feeling" and "tracking" still count
+_DEMO_TOPIC_RE = re.compile(
+    r"(?P<habit>habit|track|progress)"
+    r"|(?P<mood>feel|mood|today)"
+    r"|(?P<help>help|what can you)"
+)
+
+
+# Static tail of the /chat system prompt
+_GUIDELINES = """Guidelines:
+1. Be encouraging and supportive
+2. Reference their specific habits when relevant
+3. Acknowledge their mood and progress
+4. Provide actionable advice
+5. Keep responses concise but warm
+6. If they haven't completed habits today, gently encourage them
+7. Celebrate their successes and streaks
+8. If commitments were detected, acknowledge them naturally in your response"""
+
+
+def _prompt_json(value) -> str:
+    """Compact JSON for prompt context"""
+    return orjson.dumps(value).decode()
+
+
+def _reply_actions(message_lower: str) -> set:
+    """Names of the reply actions ('complete', 'dismiss', 'postpone') mentioned in a message"""
+    return {match.lastgroup for match in _REPLY_ACTION_RE.finditer(message_lower)}
+
+
+async def _fetch_all(stmt) -> list:
+    """Run a read-only SELECT on a dedicated async session.
+
+    An AsyncSession can't run statements concurrently, so each query gets its
+    own session (and pool connection) and callers can asyncio.gather() them.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+
+def overview_invalidator(current_user: models.User = Depends(get_current_user)) -> Callable[[], None]:
+    """Dependency for endpoints that change overview numbers.
+
+    Returns a function the endpoint calls right after committing, dropping the
+    user's cached overview before the response (and any background tasks) goes out.
+    The user id is read here, before a commit can expire the user.
+    """
+    user_id = current_user.id
+    return lambda: _overview_cache.pop(user_id, None)
+
+
 # Enhanced Chat endpoint with AI integration
 @app.post("/chat", response_model=schemas.ChatResponse)
 async def chat(
     message: schemas.ChatMessage,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
-        # Get user context - using unified commitments system
-        recurring_commitments = db.query(models.Commitment).filter(
+        today = date.today()
+        
+        # Get user context - using unified commitments system. These reads are
+        # independent, so they run concurrently, each on its own async session.
+        recurring_filter = (
             models.Commitment.user_id == current_user.id,
             models.Commitment.recurrence_pattern != "none",
             models.Commitment.status == "active"
-        ).all()
-        
-        # Get recent check-ins
-        recent_checkins = db.query(models.DailyCheckIn).filter(
-            models.DailyCheckIn.user_id == current_user.id
-        ).order_by(models.DailyCheckIn.timestamp.desc()).limit(5).all()
-        
-        # Get recent conversations for context
-        recent_convos = db.query(models.Conversation).filter(
-            models.Conversation.user_id == current_user.id
-        ).order_by(models.Conversation.timestamp.desc()).limit(5).all()
+        )
+        recurring_commitments, completed_ids, recent_checkins, recent_convos = await asyncio.gather(
+            _fetch_all(select(models.Commitment).options(raiseload("*")).where(*recurring_filter)),
+            # Completion status for today, for all recurring commitments at once
+            _fetch_all(
+                select(models.CommitmentCompletion.commitment_id).where(
+                    models.CommitmentCompletion.commitment_id.in_(
+                        select(models.Commitment.id).where(*recurring_filter)
+                    ),
+                    models.CommitmentCompletion.completion_date == today
+                )
+            ),
+            # Get recent check-ins
+            _fetch_all(
+                select(models.DailyCheckIn)
+                .options(raiseload("*"))
+                .where(models.DailyCheckIn.user_id == current_user.id)
+                .order_by(models.DailyCheckIn.timestamp.desc())
+                .limit(5)
+            ),
+            # Get recent conversations for context
+            _fetch_all(
+                select(models.Conversation)
+                .options(raiseload("*"))
+                .where(models.Conversation.user_id == current_user.id)
+                .order_by(models.Conversation.timestamp.desc())
+                .limit(5)
+            )
+        )
+        completed_ids = set(completed_ids)
         
         # Build context - recurring commitments (formerly habits)
         habit_context = []
-        today = date.today()
         for commitment in recurring_commitments:
-            # Check completion status for today
-            completed_today = db.query(models.CommitmentCompletion).filter(
-                models.CommitmentCompletion.commitment_id == commitment.id,
-                models.CommitmentCompletion.completion_date == today
-            ).first() is not None
-            
             habit_context.append({
                 "name": commitment.task_description,
                 "frequency": commitment.recurrence_pattern,
-                "completed_today": completed_today,
+                "completed_today": commitment.id in completed_ids,
                 "reminder_time": commitment.due_time.strftime("%H:%M") if commitment.due_time else None
             })
         
@@ -242,41 +406,41 @@ async def chat(
             models.Commitment.user_id == current_user.id,
             models.Commitment.status == 'pending'
         ).all()
+        active_by_id = {c.id: c for c in active_commitments}
         
         # Check if user's message indicates completion, dismissal, or postponement
         commitment_action_taken = False
         message_lower = message.message.lower()
         
-        # Keywords for different actions
-        completion_keywords = ['done', 'completed', 'finished', 'did it', 'just did', 'already did', 'yes', 'yep', 'yeah']
-        dismissal_keywords = ['cancel', 'dismiss', 'forget it', 'nevermind', 'no longer', 'not doing', 'skip']
-        postpone_keywords = ['tomorrow', 'later', 'postpone', 'delay', 'not today', 'maybe tomorrow']
+        # Classify the reply once rather than per proactive message
+        reply_actions = _reply_actions(message_lower)
+        is_completion = 'complete' in reply_actions
+        is_dismissal = 'dismiss' in reply_actions
+        is_postponement = 'postpone' in reply_actions
         
         # If there are recent proactive messages about commitments
         if recent_proactive and active_commitments:
             # Find which commitment the user might be responding to
             for proactive_msg in recent_proactive:
                 if proactive_msg.related_commitment_id:
-                    commitment = next((c for c in active_commitments if c.id == proactive_msg.related_commitment_id), None)
+                    commitment = active_by_id.get(proactive_msg.related_commitment_id)
                     if commitment:
                         # Check if user's response relates to this commitment
-                        if any(keyword in message_lower for keyword in completion_keywords):
+                        if is_completion:
                             # Mark commitment as completed
                             commitment.status = 'completed'
                             proactive_msg.user_responded = True
                             proactive_msg.response_content = message.message
                             commitment_action_taken = True
-                            db.commit()
                             break
-                        elif any(keyword in message_lower for keyword in dismissal_keywords):
+                        elif is_dismissal:
                             # Dismiss commitment
                             commitment.status = 'dismissed'
                             proactive_msg.user_responded = True
                             proactive_msg.response_content = message.message
                             commitment_action_taken = True
-                            db.commit()
                             break
-                        elif any(keyword in message_lower for keyword in postpone_keywords):
+                        elif is_postponement:
                             # Postpone commitment to tomorrow
                             tomorrow = time_service.now().date() + timedelta(days=1)
                             commitment.deadline = tomorrow
@@ -284,17 +448,17 @@ async def chat(
                             proactive_msg.user_responded = True
                             proactive_msg.response_content = message.message
                             commitment_action_taken = True
-                            db.commit()
                             break
         
         # Detect new commitments in the user's message
         detected_commitments = commitment_parser.extract_commitments(message.message)
         commitment_acknowledgments = []
         
-        # Create commitment records for detected commitments
+        # Create commitment records for detected commitments; they're committed
+        # together with the conversation at the end of the request
+        new_commitments = []
         for commitment_data in detected_commitments:
             try:
-                # Create commitment in database
                 db_commitment = models.Commitment(
                     user_id=current_user.id,
                     task_description=commitment_data['task_description'],
@@ -304,8 +468,7 @@ async def chat(
                     reminder_count=0
                 )
                 db.add(db_commitment)
-                db.commit()
-                db.refresh(db_commitment)
+                new_commitments.append(db_commitment)
                 
                 # Add acknowledgment for AI response
                 deadline_str = commitment_data['deadline'].strftime("%A, %B %d")
@@ -324,7 +487,6 @@ async def chat(
                 continue
         
         # Create system prompt
-        import json
         commitment_context = ""
         commitment_action_context = ""
         
@@ -345,33 +507,24 @@ Detected commitments from this message that you should acknowledge:
 
 Important: Include these commitment acknowledgments naturally in your response to show you're tracking their commitments."""
 
-        system_prompt = f"""You are a friendly, supportive personal AI assistant helping {current_user.username} with their habits and personal development.
-
-Current habits:
-{json.dumps(habit_context, indent=2)}
-
-Recent mood check-ins:
-{json.dumps(mood_context, indent=2)}
-
-Recent conversation history:
-{chr(10).join(conversation_history[-10:])}
-{commitment_context}
-{commitment_action_context}
-
-Guidelines:
-1. Be encouraging and supportive
-2. Reference their specific habits when relevant
-3. Acknowledge their mood and progress
-4. Provide actionable advice
-5. Keep responses concise but warm
-6. If they haven't completed habits today, gently encourage them
-7. Celebrate their successes and streaks
-8. If commitments were detected, acknowledge them naturally in your response"""
+        parts = [
+            "You are a friendly, supportive personal AI assistant helping ",
+            current_user.username,
+            " with their habits and personal development.",
+        ]
+        if habit_context:
+            parts += ["\n\nCurrent habits:\n", _prompt_json(habit_context)]
+        if mood_context:
+            parts += ["\n\nRecent mood check-ins:\n", _prompt_json(mood_context)]
+        if conversation_history:
+            parts += ["\n\nRecent conversation history:\n", "\n".join(conversation_history[-10:])]
+        parts += [commitment_context, commitment_action_context, "\n\n", _GUIDELINES]
+        system_prompt = "".join(parts)
 
         # Call AI API
-        if anthropic_client and os.getenv("ANTHROPIC_API_KEY"):
+        if anthropic_client and _HAS_ANTHROPIC_KEY:
             # Use Claude
-            response = anthropic_client.messages.create(
+            response = await anthropic_client.messages.create(
                 model="claude-3-haiku-20240307",  # Fast model for chat
                 max_tokens=500,
                 temperature=0.7,
@@ -392,32 +545,19 @@ Guidelines:
             response=response_text
         )
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
         
-        # Update commitments with conversation reference
-        if detected_commitments:
-            for commitment_data in detected_commitments:
-                try:
-                    # Find the commitment we just created and update with conversation ID
-                    db_commitment = db.query(models.Commitment).filter(
-                        models.Commitment.user_id == current_user.id,
-                        models.Commitment.task_description == commitment_data['task_description'],
-                        models.Commitment.original_message == commitment_data['original_message'],
-                        models.Commitment.created_from_conversation_id.is_(None)
-                    ).first()
-                    
-                    if db_commitment:
-                        db_commitment.created_from_conversation_id = conversation.id
-                        db.commit()
-                except Exception as e:
-                    print(f"Error updating commitment with conversation ID: {e}")
-                    continue
+        # Link the new commitments to this conversation and commit everything at once
+        for db_commitment in new_commitments:
+            db_commitment.conversation = conversation
+        db.flush()
+        timestamp = conversation.timestamp
+        db.commit()
+        invalidate_overview()
         
         return schemas.ChatResponse(
             message=message.message,
             response=response_text,
-            timestamp=conversation.timestamp
+            timestamp=timestamp
         )
         
     except Exception as e:
@@ -432,6 +572,7 @@ Guidelines:
         )
         db.add(conversation)
         db.commit()
+        invalidate_overview()
         
         return schemas.ChatResponse(
             message=message.message,
@@ -443,6 +584,8 @@ Guidelines:
 @app.post("/chat/enhanced", response_model=schemas.ChatResponse)
 async def enhanced_chat(
     message: schemas.ChatMessageEnhanced,
+    background_tasks: BackgroundTasks,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -484,7 +627,7 @@ async def enhanced_chat(
             }
         
         # 3. LLM Processing with Structured Output
-        ai_response = llm_processor.process_message(
+        ai_response = await llm_processor.process_message(
             message.message,
             intent,
             context,
@@ -492,7 +635,10 @@ async def enhanced_chat(
         )
         
         # Debug: Log the structured response
-        debug_logger.info(f"📊 Structured AI Response: message='{ai_response.message[:100]}...', commitments={len(ai_response.commitments)}, habits={len(ai_response.habit_actions)}")
+        debug_logger.info(
+            "📊 Structured AI Response: message='%.100s...', commitments=%d, habits=%d",
+            ai_response.message, len(ai_response.commitments), len(ai_response.habit_actions)
+        )
         
         # 4. Action Processing
         processing_result = await action_processor.process_response(
@@ -510,21 +656,21 @@ async def enhanced_chat(
             timestamp=time_service.now()
         )
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
         
         # Update session's last_message_at
         chat_session.last_message_at = time_service.now()
+        db.flush()
+        # Detach so the commit doesn't expire it; the background embedding
+        # reads its attributes after this session is gone
+        db.expunge(conversation)
         db.commit()
+        invalidate_overview()
         
-        # 6. Embed the conversation for future semantic search
-        try:
-            vector_store.embed_conversation(conversation)
-        except Exception as e:
-            debug_logger.warning(f"Failed to embed conversation {conversation.id}: {e}")
+        # 6. Embed the conversation for future semantic search, after the response is sent
+        background_tasks.add_task(vector_store.embed_conversation, conversation)
         
         # 7. Return enhanced response
-        debug_logger.end_pipeline_execution(success=True)
+        debug_logger.end_pipeline_execution(success=True, db_queries=get_db_query_count())
         
         return schemas.ChatResponse(
             message=message.message,
@@ -533,7 +679,7 @@ async def enhanced_chat(
         )
         
     except Exception as e:
-        debug_logger.error(f"Enhanced chat error: {str(e)}")
+        debug_logger.error("Enhanced chat error: %s", e)
         # Fallback to basic response
         fallback_response = "I'm here to help! Tell me about your day or ask me anything about your habits."
         
@@ -546,16 +692,15 @@ async def enhanced_chat(
             timestamp=time_service.now()
         )
         db.add(conversation)
+        db.flush()
+        db.expunge(conversation)
         db.commit()
-        db.refresh(conversation)
+        invalidate_overview()
         
         # Embed the fallback conversation too
-        try:
-            vector_store.embed_conversation(conversation)
-        except Exception as e:
-            debug_logger.warning(f"Failed to embed fallback conversation {conversation.id}: {e}")
+        background_tasks.add_task(vector_store.embed_conversation, conversation)
         
-        debug_logger.end_pipeline_execution(success=False, error=str(e))
+        debug_logger.end_pipeline_execution(success=False, error=str(e), db_queries=get_db_query_count())
         
         return schemas.ChatResponse(
             message=message.message,
@@ -565,12 +710,12 @@ async def enhanced_chat(
 
 def generate_demo_response(message: str, habits: list, moods: list, commitment_acknowledgments: list = None) -> str:
     """Generate a demo response when no AI API is available"""
-    message_lower = message.lower()
+    topics = {match.lastgroup for match in _DEMO_TOPIC_RE.finditer(message.lower())}
     
     # Build base response
     base_response = ""
     
-    if any(word in message_lower for word in ['habit', 'track', 'progress']):
+    if 'habit' in topics:
         if habits:
             completed = sum(1 for h in habits if h['completed_today'])
             total = len(habits)
@@ -578,7 +723,7 @@ def generate_demo_response(message: str, habits: list, moods: list, commitment_a
         else:
             base_response = "I notice you haven't set up any habits yet. Would you like to start with something simple like daily meditation or drinking more water?"
     
-    elif any(word in message_lower for word in ['feel', 'mood', 'today']):
+    elif 'mood' in topics:
         if moods and moods[0]['mood']:
             mood_score = moods[0]['mood']
             if mood_score >= 4:
@@ -588,7 +733,7 @@ def generate_demo_response(message: str, habits: list, moods: list, commitment_a
         else:
             base_response = "How are you feeling today? I'm here to listen and support you."
     
-    elif any(word in message_lower for word in ['help', 'what can you']):
+    elif 'help' in topics:
         base_response = "I can help you track habits, check in on your mood, provide motivation, and offer advice on building better routines. What would you like to focus on?"
     
     else:
@@ -602,28 +747,33 @@ def generate_demo_response(message: str, habits: list, moods: list, commitment_a
     return base_response
 
 # Get chat history endpoint
-@app.get("/chat/history/{session_id}")
-def get_chat_history(
+@app.get("/chat/history/{session_id}", response_class=ORJSONResponse)
+async def get_chat_history(
     session_id: str,
     limit: int = 50,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify session belongs to user
-    chat_session = db.query(models.ChatSession).filter(
-        models.ChatSession.id == session_id,
-        models.ChatSession.user_id == current_user.id
-    ).first()
+    session_exists = await db.scalar(
+        select(models.ChatSession.id).where(
+            models.ChatSession.id == session_id,
+            models.ChatSession.user_id == current_user.id
+        ).limit(1)
+    ) is not None
     
-    if not chat_session:
+    if not session_exists:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    conversations = db.query(models.Conversation).filter(
-        models.Conversation.user_id == current_user.id,
-        models.Conversation.session_id == session_id
-    ).order_by(models.Conversation.timestamp.desc()).limit(limit).all()
+    result = await db.execute(
+        select(models.Conversation).options(raiseload("*")).where(
+            models.Conversation.user_id == current_user.id,
+            models.Conversation.session_id == session_id
+        ).order_by(models.Conversation.timestamp.desc()).limit(limit)
+    )
+    conversations = result.scalars().all()
     
-    return [
+    return ORJSONResponse([
         {
             "id": conv.id,
             "message": conv.message,
@@ -631,35 +781,66 @@ def get_chat_history(
             "timestamp": conv.timestamp
         }
         for conv in reversed(conversations)  # Return in chronological order
-    ]
+    ])
+
+def _commit_returning(db: Session, stmt):
+    """Run an INSERT/UPDATE ... RETURNING statement and commit in one round-trip.
+
+    The returned row is detached before the commit so it isn't expired and
+    re-SELECTed when the response is serialized. Returns None if no row matched.
+    """
+    obj = db.scalars(stmt).one_or_none()
+    if obj is not None:
+        db.expunge(obj)
+    db.commit()
+    return obj
+
+def _commit_returning_commitment(db: Session, stmt):
+    """_commit_returning for an INSERT/UPDATE on commitments (without .returning()).
+
+    is_recurring is added to the RETURNING clause. completed_today is a per-query
+    expression that RETURNING can't carry, so it is reported as False, which is
+    what a plain load of the row gives.
+    """
+    commitment = _commit_returning(db, stmt.returning(models.Commitment, models.Commitment.is_recurring))
+    if commitment is not None:
+        set_committed_value(commitment, "completed_today", False)
+    return commitment
+
 
 # Daily check-in endpoint
 @app.post("/checkin/daily", response_model=schemas.DailyCheckIn)
 def create_daily_checkin(
     checkin: schemas.DailyCheckInCreate,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    db_checkin = models.DailyCheckIn(
-        **checkin.dict(),
-        user_id=current_user.id
+    db_checkin = _commit_returning(
+        db,
+        insert(models.DailyCheckIn)
+        .values(**checkin.dict(), user_id=current_user.id)
+        .returning(models.DailyCheckIn)
     )
-    db.add(db_checkin)
-    db.commit()
-    db.refresh(db_checkin)
+    invalidate_overview()
     return db_checkin
 
 
 # People endpoints
-@app.get("/people", response_model=List[schemas.Person])
-def get_people(
+# Columns matching schemas.Person, so the list endpoint can skip ORM and Pydantic
+_PERSON_COLUMNS = [getattr(models.Person, field) for field in schemas.Person.model_fields]
+
+@app.get("/people", response_model=None)
+async def get_people(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    people = db.query(models.Person).filter(
-        models.Person.user_id == current_user.id
-    ).order_by(models.Person.name).all()
-    return people
+    result = await db.execute(
+        select(*_PERSON_COLUMNS).where(
+            models.Person.user_id == current_user.id
+        ).order_by(models.Person.name)
+    )
+    return ORJSONResponse([dict(row) for row in result.mappings()])
 
 @app.post("/people", response_model=schemas.Person)
 def create_person(
@@ -667,32 +848,33 @@ def create_person(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    db_person = models.Person(
-        **person.dict(),
-        user_id=current_user.id
+    db_person = _commit_returning(
+        db,
+        insert(models.Person)
+        .values(**person.dict(), user_id=current_user.id)
+        .returning(models.Person)
     )
-    db.add(db_person)
-    db.commit()
-    db.refresh(db_person)
     
     # Embed the new person for semantic search
     try:
         vector_store.embed_person(db_person)
     except Exception as e:
-        debug_logger.warning(f"Failed to embed person {db_person.id}: {e}")
+        debug_logger.warning("Failed to embed person %s: %s", db_person.id, e)
     
     return db_person
 
 @app.get("/people/{person_id}", response_model=schemas.Person)
-def get_person(
+async def get_person(
     person_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    person = db.query(models.Person).filter(
-        models.Person.id == person_id,
-        models.Person.user_id == current_user.id
-    ).first()
+    person = await db.scalar(
+        select(models.Person).options(raiseload("*")).where(
+            models.Person.id == person_id,
+            models.Person.user_id == current_user.id
+        )
+    )
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
     return person
@@ -704,19 +886,18 @@ def update_person(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    person = db.query(models.Person).filter(
-        models.Person.id == person_id,
-        models.Person.user_id == current_user.id
-    ).first()
+    person = _commit_returning(
+        db,
+        update(models.Person)
+        .where(
+            models.Person.id == person_id,
+            models.Person.user_id == current_user.id
+        )
+        .values(**person_update.dict(exclude_unset=True), updated_at=datetime.utcnow())
+        .returning(models.Person)
+    )
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
-    
-    for field, value in person_update.dict(exclude_unset=True).items():
-        setattr(person, field, value)
-    
-    person.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(person)
     return person
 
 @app.delete("/people/{person_id}")
@@ -739,13 +920,15 @@ def delete_person(
 
 # User Profile endpoints
 @app.get("/profile", response_model=schemas.UserProfile)
-def get_user_profile(
+async def get_user_profile(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    profile = db.query(models.UserProfile).filter(
-        models.UserProfile.user_id == current_user.id
-    ).first()
+    profile = await db.scalar(
+        select(models.UserProfile).options(raiseload("*")).where(
+            models.UserProfile.user_id == current_user.id
+        )
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
@@ -757,20 +940,18 @@ def create_user_profile(
     db: Session = Depends(get_db)
 ):
     # Check if profile already exists
-    existing_profile = db.query(models.UserProfile).filter(
+    existing_profile_id = db.query(models.UserProfile.id).filter(
         models.UserProfile.user_id == current_user.id
-    ).first()
-    if existing_profile:
+    ).limit(1).scalar()
+    if existing_profile_id is not None:
         raise HTTPException(status_code=400, detail="Profile already exists")
     
-    db_profile = models.UserProfile(
-        **profile.dict(),
-        user_id=current_user.id
+    return _commit_returning(
+        db,
+        insert(models.UserProfile)
+        .values(**profile.dict(), user_id=current_user.id)
+        .returning(models.UserProfile)
     )
-    db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
-    return db_profile
 
 @app.put("/profile", response_model=schemas.UserProfile)
 def update_user_profile(
@@ -778,26 +959,77 @@ def update_user_profile(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    profile = db.query(models.UserProfile).filter(
-        models.UserProfile.user_id == current_user.id
-    ).first()
+    profile = _commit_returning(
+        db,
+        update(models.UserProfile)
+        .where(models.UserProfile.user_id == current_user.id)
+        .values(**profile_update.dict(exclude_unset=True), updated_at=datetime.utcnow())
+        .returning(models.UserProfile)
+    )
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
-    
-    for field, value in profile_update.dict(exclude_unset=True).items():
-        setattr(profile, field, value)
-    
-    profile.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(profile)
     return profile
 
 
+# Keyset pagination for list endpoints. Paging is opt-in: without limit or
+# cursor every row is returned as before; otherwise the page is returned and
+# the cursor for the next one, if any, in the X-Next-Cursor header.
+DEFAULT_PAGE_SIZE = 50
+
+def _encode_cursor(value, row_id) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([value, row_id])).decode()
+
+def _decode_cursor(cursor: str, column):
+    """(sort value, id) from a cursor made by _encode_cursor; 400 if it's malformed"""
+    try:
+        value, row_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        if value is not None and column is not None:
+            python_type = column.type.python_type
+            value = python_type.fromisoformat(value) if python_type in (datetime, date) else python_type(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id
+
+def _keyset_after(column, id_column, value, last_id, descending: bool):
+    """Rows past (value, last_id) in ORDER BY column NULLS LAST, id_column (same direction)"""
+    past = operator.lt if descending else operator.gt
+    after_id = past(id_column, last_id)
+    if column is None:
+        return after_id
+    if value is None:
+        return and_(column.is_(None), after_id)
+    return or_(past(column, value), and_(column == value, after_id), column.is_(None))
+
+def _page_limit(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """Page size for a list request, or None to return every row (neither limit nor cursor given)"""
+    if limit is None and cursor:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+def _page(rows, limit: Optional[int], cursor_key):
+    """Drop the extra probe row (fetched as LIMIT limit + 1); returns the page and the next cursor, if any"""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode_cursor(*cursor_key(rows[-1]))
+
+_COMMITMENT_SORT_COLUMNS = {
+    "deadline": models.Commitment.deadline,
+    "created_at": models.Commitment.created_at,
+    "completion_count": models.Commitment.completion_count,
+}
+
+# Columns matching schemas.Commitment (completed_today is computed per query),
+# so the list endpoint can skip ORM and Pydantic
+_COMMITMENT_COLUMNS = [
+    getattr(models.Commitment, field) for field in schemas.Commitment.model_fields if field != "completed_today"
+]
+
+
 # Proactive AI endpoints
 
 # Commitment management endpoints
-@app.get("/commitments", response_model=List[schemas.Commitment])
-def get_commitments(
+async def _commitment_page(
     status: Optional[str] = None,
     overdue: Optional[bool] = None,
     sort_by: Optional[str] = "created_at",
@@ -805,36 +1037,49 @@ def get_commitments(
     type: Optional[str] = None,  # all, one-time, recurring
     recurrence: Optional[str] = None,  # none, daily, weekly, monthly
     due: Optional[str] = None,  # today, this-week, overdue, upcoming
+    limit: Annotated[Optional[int], Query(ge=1, le=200)] = None,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get commitments with comprehensive filtering for unified system
     Supports both one-time and recurring commitments (formerly habits)
+    
+    Returns (rows as dicts shaped like schemas.Commitment, next page cursor).
     """
-    query = db.query(models.Commitment).filter(
+    today = date.today()
+    # completed_today is a correlated EXISTS on today's completions (is_recurring
+    # is a column_property on the model)
+    completed_today = and_(
+        models.Commitment.is_recurring,
+        select(models.CommitmentCompletion.id).where(
+            models.CommitmentCompletion.commitment_id == models.Commitment.id,
+            models.CommitmentCompletion.completion_date == today
+        ).exists()
+    )
+    stmt = select(*_COMMITMENT_COLUMNS, completed_today.label("completed_today")).where(
         models.Commitment.user_id == current_user.id
     )
     
     # Filter by status
     if status:
-        query = query.filter(models.Commitment.status == status)
+        stmt = stmt.where(models.Commitment.status == status)
     
     # Filter by type (unified system)
     if type == "one-time":
-        query = query.filter(models.Commitment.recurrence_pattern == "none")
+        stmt = stmt.where(models.Commitment.recurrence_pattern == "none")
     elif type == "recurring":
-        query = query.filter(models.Commitment.recurrence_pattern != "none")
+        stmt = stmt.where(models.Commitment.recurrence_pattern != "none")
     
     # Filter by specific recurrence pattern
     if recurrence:
-        query = query.filter(models.Commitment.recurrence_pattern == recurrence)
+        stmt = stmt.where(models.Commitment.recurrence_pattern == recurrence)
     
     # Filter by due date
-    today = date.today()
     if due == "today":
         # One-time due today OR recurring that should be done today
-        query = query.filter(
+        stmt = stmt.where(
             or_(
                 and_(
                     models.Commitment.recurrence_pattern == "none",
@@ -848,7 +1093,7 @@ def get_commitments(
         )
     elif due == "this-week":
         week_end = today + timedelta(days=7)
-        query = query.filter(
+        stmt = stmt.where(
             or_(
                 and_(
                     models.Commitment.recurrence_pattern == "none",
@@ -861,13 +1106,13 @@ def get_commitments(
             )
         )
     elif due == "overdue":
-        query = query.filter(
+        stmt = stmt.where(
             models.Commitment.recurrence_pattern == "none",
             models.Commitment.deadline < today,
             models.Commitment.status == "pending"
         )
     elif due == "upcoming":
-        query = query.filter(
+        stmt = stmt.where(
             models.Commitment.recurrence_pattern == "none",
             models.Commitment.deadline > today,
             models.Commitment.status == "pending"
@@ -876,172 +1121,195 @@ def get_commitments(
     # Legacy overdue filter (for backward compatibility)
     if overdue is not None:
         if overdue:
-            query = query.filter(
+            stmt = stmt.where(
                 models.Commitment.deadline < today,
                 models.Commitment.status == "pending"
             )
         else:
-            query = query.filter(
+            stmt = stmt.where(
                 models.Commitment.deadline >= today
             )
     
-    # Sorting
-    if sort_by == "deadline":
-        if order == "asc":
-            query = query.order_by(models.Commitment.deadline.asc())
-        else:
-            query = query.order_by(models.Commitment.deadline.desc())
-    elif sort_by == "created_at":
-        if order == "asc":
-            query = query.order_by(models.Commitment.created_at.asc())
-        else:
-            query = query.order_by(models.Commitment.created_at.desc())
-    elif sort_by == "completion_count":
-        if order == "asc":
-            query = query.order_by(models.Commitment.completion_count.asc())
-        else:
-            query = query.order_by(models.Commitment.completion_count.desc())
-    
-    commitments = query.all()
-    
-    # Add computed fields
-    for commitment in commitments:
-        commitment.is_recurring = commitment.recurrence_pattern != "none"
-        
-        # Check if completed today (for recurring commitments)
-        if commitment.is_recurring:
-            completion = db.query(models.CommitmentCompletion).filter(
-                models.CommitmentCompletion.commitment_id == commitment.id,
-                models.CommitmentCompletion.completion_date == today
-            ).first()
-            commitment.completed_today = completion is not None
-        else:
-            commitment.completed_today = False
-    
-    return commitments
+    # Sorting (NULLs last on either dialect)
+    descending = order != "asc"
+    sort_column = _COMMITMENT_SORT_COLUMNS.get(sort_by)
+    if sort_column is not None:
+        stmt = stmt.order_by((sort_column.desc() if descending else sort_column.asc()).nullslast())
+    
+    # Break ties by id in the same direction, so the order is stable whichever
+    # (user_id, <sort column>) index the planner walks and the cursor can resume it
+    stmt = stmt.order_by(models.Commitment.id.desc() if descending else models.Commitment.id.asc())
+    
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort_column)
+        stmt = stmt.where(_keyset_after(sort_column, models.Commitment.id, value, last_id, descending))
+    limit = _page_limit(limit, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    
+    result = await db.execute(stmt)
+    return _page(
+        [dict(row) for row in result.mappings()], limit,
+        lambda commitment: (commitment[sort_column.key] if sort_column is not None else None, commitment["id"])
+    )
+
+@app.get("/commitments", response_model=None)
+async def get_commitments(page: tuple = Depends(_commitment_page)):
+    commitments, next_cursor = page
+    return ORJSONResponse(commitments, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 @app.post("/commitments/{commitment_id}/complete")
-def complete_commitment(
+async def complete_commitment(
     commitment_id: int,
     completion_data: schemas.CommitmentCompletionCreate = None,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a commitment as completed (unified system)
     For one-time commitments: marks as completed
     For recurring commitments: logs completion for today
     """
-    commitment = db.query(models.Commitment).filter(
-        models.Commitment.id == commitment_id,
-        models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
+    # One-time commitment - mark as completed in a single guarded UPDATE
+    completed_id = await db.scalar(
+        update(models.Commitment)
+        .where(
+            models.Commitment.id == commitment_id,
+            models.Commitment.user_id == current_user.id,
+            models.Commitment.recurrence_pattern == "none"
+        )
+        .values(status="completed")
+        .returning(models.Commitment.id)
+    )
+    if completed_id is not None:
+        await db.commit()
+        invalidate_overview()
+        return {"message": "Commitment marked as completed"}
+    
+    owned_id = await db.scalar(
+        select(models.Commitment.id).where(
+            models.Commitment.id == commitment_id,
+            models.Commitment.user_id == current_user.id
+        )
+    )
+    if owned_id is None:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
-    if commitment.recurrence_pattern == "none":
-        # One-time commitment - mark as completed
-        commitment.status = "completed"
-        db.commit()
-        return {"message": "Commitment marked as completed"}
-    else:
-        # Recurring commitment - log completion for today
-        today = completion_data.completion_date if completion_data and completion_data.completion_date else date.today()
-        
-        # Check if already completed for this date
-        existing = db.query(models.CommitmentCompletion).filter(
-            models.CommitmentCompletion.commitment_id == commitment_id,
-            models.CommitmentCompletion.completion_date == today
-        ).first()
-        
-        if existing:
-            return {"message": f"Commitment already completed for {today}"}
-        
-        # Create completion record
-        completion = models.CommitmentCompletion(
+    # Recurring commitment - log completion for today
+    today = completion_data.completion_date if completion_data and completion_data.completion_date else date.today()
+    
+    # Create the completion record unless one exists for this date; the unique
+    # (commitment_id, completion_date) index makes this a single race-free statement.
+    # completion_count / last_completed_at are bumped by the completions trigger.
+    conflict_insert = _CONFLICT_INSERTS[db.get_bind().dialect.name]
+    completion_id = await db.scalar(
+        conflict_insert(models.CommitmentCompletion)
+        .values(
             commitment_id=commitment_id,
             user_id=current_user.id,
             completion_date=today,
+            completed_at=datetime.utcnow(),
             notes=completion_data.notes if completion_data else None,
             skipped=False
         )
-        db.add(completion)
-        
-        # Update commitment stats
-        commitment.completion_count += 1
-        commitment.last_completed_at = datetime.utcnow()
-        
-        db.commit()
-        return {"message": f"Recurring commitment completed for {today}"}
+        .on_conflict_do_nothing(index_elements=["commitment_id", "completion_date"])
+        .returning(models.CommitmentCompletion.id)
+    )
     
-    db.commit()
-    return {"message": "Commitment completed"}
+    if completion_id is None:
+        return {"message": f"Commitment already completed for {today}"}
+    
+    await db.commit()
+    invalidate_overview()
+    return {"message": f"Recurring commitment completed for {today}"}
 
 @app.post("/commitments/{commitment_id}/dismiss")
 def dismiss_commitment(
     commitment_id: int,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    commitment = db.query(models.Commitment).filter(
-        models.Commitment.id == commitment_id,
-        models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
+    dismissed_id = db.scalar(
+        update(models.Commitment)
+        .where(
+            models.Commitment.id == commitment_id,
+            models.Commitment.user_id == current_user.id
+        )
+        .values(status="dismissed")
+        .returning(models.Commitment.id)
+    )
+    if dismissed_id is None:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
-    commitment.status = "dismissed"
     db.commit()
+    invalidate_overview()
     return {"message": "Commitment dismissed"}
 
 @app.post("/commitments/{commitment_id}/postpone")
 def postpone_commitment(
     commitment_id: int,
     commitment_update: schemas.CommitmentUpdate,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    commitment = db.query(models.Commitment).filter(
-        models.Commitment.id == commitment_id,
-        models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
+    values = {"status": "pending", "reminder_count": 0}  # Reset reminder count
+    if commitment_update.deadline:
+        values["deadline"] = commitment_update.deadline
+    
+    postponed_id = db.scalar(
+        update(models.Commitment)
+        .where(
+            models.Commitment.id == commitment_id,
+            models.Commitment.user_id == current_user.id
+        )
+        .values(**values)
+        .returning(models.Commitment.id)
+    )
+    if postponed_id is None:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
-    if commitment_update.deadline:
-        commitment.deadline = commitment_update.deadline
-    commitment.status = "pending"
-    commitment.reminder_count = 0  # Reset reminder count
     db.commit()
+    invalidate_overview()
     return {"message": "Commitment postponed"}
 
 @app.put("/commitments/{commitment_id}", response_model=schemas.Commitment)
 def update_commitment(
     commitment_id: int,
     commitment_update: schemas.CommitmentUpdate,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    commitment = db.query(models.Commitment).filter(
-        models.Commitment.id == commitment_id,
-        models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
-        raise HTTPException(status_code=404, detail="Commitment not found")
-    
     # Update fields if provided
+    patch = {}
     if commitment_update.status:
-        commitment.status = commitment_update.status
+        patch["status"] = commitment_update.status
     if commitment_update.deadline:
-        commitment.deadline = commitment_update.deadline
+        patch["deadline"] = commitment_update.deadline
     
-    db.commit()
-    db.refresh(commitment)
+    criteria = (
+        models.Commitment.id == commitment_id,
+        models.Commitment.user_id == current_user.id
+    )
+    if patch:
+        commitment = _commit_returning_commitment(
+            db, update(models.Commitment).where(*criteria).values(**patch)
+        )
+    else:
+        commitment = _commit_returning(db, select(models.Commitment).where(*criteria))
+    
+    if not commitment:
+        raise HTTPException(status_code=404, detail="Commitment not found")
+    invalidate_overview()
     return commitment
 
 @app.delete("/commitments/{commitment_id}")
 def delete_commitment(
     commitment_id: int,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1052,8 +1320,16 @@ def delete_commitment(
     if not commitment:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
+    # Unlink its proactive messages explicitly too (older databases lack the
+    # ON DELETE SET NULL action on related_commitment_id)
+    db.execute(
+        update(models.ProactiveMessage)
+        .where(models.ProactiveMessage.related_commitment_id == commitment_id)
+        .values(related_commitment_id=None)
+    )
     db.delete(commitment)
     db.commit()
+    invalidate_overview()
     return {"message": "Commitment deleted"}
 
 # New unified system endpoints
@@ -1061,6 +1337,7 @@ def delete_commitment(
 def skip_commitment(
     commitment_id: int,
     skip_data: dict = {},
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1099,6 +1376,7 @@ def skip_commitment(
     )
     db.add(skip_record)
     db.commit()
+    invalidate_overview()
     
     return {"message": f"Commitment skipped for {today}"}
 
@@ -1111,11 +1389,11 @@ def get_commitment_completions(
     db: Session = Depends(get_db)
 ):
     """Get completion history for a commitment"""
-    commitment = db.query(models.Commitment).filter(
+    owned_id = db.query(models.Commitment.id).filter(
         models.Commitment.id == commitment_id,
         models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
+    ).limit(1).scalar()
+    if owned_id is None:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
     query = db.query(models.CommitmentCompletion).filter(
@@ -1132,34 +1410,30 @@ def get_commitment_completions(
 @app.post("/commitments", response_model=schemas.Commitment)
 def create_commitment(
     commitment: schemas.CommitmentCreate,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new commitment (one-time or recurring)"""
-    db_commitment = models.Commitment(
-        user_id=current_user.id,
-        task_description=commitment.task_description,
-        original_message=commitment.original_message,
-        deadline=commitment.deadline,
-        recurrence_pattern=commitment.recurrence_pattern,
-        recurrence_interval=commitment.recurrence_interval,
-        recurrence_days=commitment.recurrence_days,
-        recurrence_end_date=commitment.recurrence_end_date,
-        due_time=commitment.due_time,
-        reminder_settings=commitment.reminder_settings,
-        status="active" if commitment.recurrence_pattern != "none" else "pending",
-        completion_count=0,
-        created_from_conversation_id=commitment.created_from_conversation_id
+    db_commitment = _commit_returning_commitment(
+        db,
+        insert(models.Commitment).values(
+            user_id=current_user.id,
+            task_description=commitment.task_description,
+            original_message=commitment.original_message,
+            deadline=commitment.deadline,
+            recurrence_pattern=commitment.recurrence_pattern,
+            recurrence_interval=commitment.recurrence_interval,
+            recurrence_days=commitment.recurrence_days,
+            recurrence_end_date=commitment.recurrence_end_date,
+            due_time=commitment.due_time,
+            reminder_settings=commitment.reminder_settings,
+            status="active" if commitment.recurrence_pattern != "none" else "pending",
+            completion_count=0,
+            created_from_conversation_id=commitment.created_from_conversation_id
+        )
     )
-    
-    db.add(db_commitment)
-    db.commit()
-    db.refresh(db_commitment)
-    
-    # Add computed fields
-    db_commitment.is_recurring = db_commitment.recurrence_pattern != "none"
-    db_commitment.completed_today = False
-    
+    invalidate_overview()
     return db_commitment
 
 @app.get("/commitments/{commitment_id}/reminders", response_model=List[schemas.ProactiveMessage])
@@ -1169,11 +1443,11 @@ def get_commitment_reminders(
     db: Session = Depends(get_db)
 ):
     # First verify the commitment belongs to the user
-    commitment = db.query(models.Commitment).filter(
+    owned_id = db.query(models.Commitment.id).filter(
         models.Commitment.id == commitment_id,
         models.Commitment.user_id == current_user.id
-    ).first()
-    if not commitment:
+    ).limit(1).scalar()
+    if owned_id is None:
         raise HTTPException(status_code=404, detail="Commitment not found")
     
     # Get all proactive messages related to this commitment
@@ -1217,14 +1491,16 @@ def acknowledge_proactive_message(
 
 # Scheduled prompt endpoints
 @app.get("/scheduled-prompts", response_model=List[schemas.ScheduledPrompt])
-def get_scheduled_prompts(
+async def get_scheduled_prompts(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    prompts = db.query(models.ScheduledPrompt).filter(
-        models.ScheduledPrompt.user_id == current_user.id
-    ).all()
-    return prompts
+    prompts = await db.scalars(
+        select(models.ScheduledPrompt).options(raiseload("*")).where(
+            models.ScheduledPrompt.user_id == current_user.id
+        )
+    )
+    return prompts.all()
 
 @app.put("/scheduled-prompts/{prompt_id}", response_model=schemas.ScheduledPrompt)
 def update_scheduled_prompt(
@@ -1233,18 +1509,33 @@ def update_scheduled_prompt(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    prompt = db.query(models.ScheduledPrompt).filter(
+    patch = prompt_update.dict(exclude_unset=True)
+    criteria = (
         models.ScheduledPrompt.id == prompt_id,
         models.ScheduledPrompt.user_id == current_user.id
-    ).first()
+    )
+    if patch:
+        stmt = (
+            update(models.ScheduledPrompt)
+            .where(*criteria)
+            .values(**patch)
+            .returning(models.ScheduledPrompt)
+        )
+    else:
+        stmt = select(models.ScheduledPrompt).where(*criteria)
+    prompt = _commit_returning(db, stmt)
     if not prompt:
         raise HTTPException(status_code=404, detail="Scheduled prompt not found")
     
-    for field, value in prompt_update.dict(exclude_unset=True).items():
-        setattr(prompt, field, value)
-    
-    db.commit()
-    db.refresh(prompt)
+    # A new time, days or re-activation moves the next send
+    if patch.keys() & {"schedule_time", "schedule_days", "is_active"}:
+        schedule_next_prompt(prompt, time_service.now())
+        db.execute(
+            update(models.ScheduledPrompt)
+            .where(models.ScheduledPrompt.id == prompt.id)
+            .values(next_due_at=prompt.next_due_at)
+        )
+        db.commit()
     return prompt
 
 
@@ -1257,31 +1548,27 @@ async def create_session(
 ):
     """Create a new chat session"""
     session_id = str(uuid.uuid4())
+    created_at = time_service.now()
     
     # Create session
     chat_session = models.ChatSession(
         id=session_id,
         user_id=current_user.id,
         name=session_data.name,
-        created_at=time_service.now()
+        created_at=created_at,
+        is_active=True
     )
     db.add(chat_session)
     db.commit()
-    db.refresh(chat_session)
-    
-    # Get message count (will be 0 for new session)
-    message_count = db.query(models.Conversation).filter(
-        models.Conversation.user_id == current_user.id,
-        models.Conversation.session_id == session_id
-    ).count()
     
+    # Built from the values just written; reading chat_session after the commit would re-SELECT it
     return schemas.SessionResponse(
-        id=chat_session.id,
-        name=chat_session.name,
-        created_at=chat_session.created_at,
-        last_message_at=chat_session.last_message_at,
-        message_count=message_count,
-        is_active=chat_session.is_active
+        id=session_id,
+        name=session_data.name,
+        created_at=created_at,
+        last_message_at=None,
+        message_count=0,  # New session, nothing to count
+        is_active=True
     )
 
 
@@ -1292,25 +1579,26 @@ async def create_session_auto(
 ):
     """Create a new chat session with auto-generated name"""
     session_id = str(uuid.uuid4())
+    created_at = time_service.now()
     
     # Create session with temporary name
     chat_session = models.ChatSession(
         id=session_id,
         user_id=current_user.id,
         name="New Chat",
-        created_at=time_service.now()
+        created_at=created_at,
+        is_active=True
     )
     db.add(chat_session)
     db.commit()
-    db.refresh(chat_session)
     
     return schemas.SessionResponse(
-        id=chat_session.id,
-        name=chat_session.name,
-        created_at=chat_session.created_at,
-        last_message_at=chat_session.last_message_at,
+        id=session_id,
+        name="New Chat",
+        created_at=created_at,
+        last_message_at=None,
         message_count=0,
-        is_active=chat_session.is_active
+        is_active=True
     )
 
 
@@ -1341,7 +1629,7 @@ async def generate_session_name(
         return {"message": "No messages to generate name from"}
     
     # Generate name using LLM
-    new_name = llm_processor.generate_session_name(messages)
+    new_name = await llm_processor.generate_session_name(messages)
     
     # Update session name
     session.name = new_name
@@ -1362,32 +1650,51 @@ def get_active_session_id(user_id: int, db: Session) -> Optional[str]:
 
 @app.get("/sessions", response_model=List[schemas.SessionResponse])
 async def get_sessions(
+    response: Response,
+    limit: Annotated[Optional[int], Query(ge=1, le=200)] = None,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all sessions for current user"""
-    sessions = db.query(models.ChatSession).filter(
-        models.ChatSession.user_id == current_user.id
-    ).order_by(models.ChatSession.last_message_at.desc().nullslast()).all()
+    """Get the current user's sessions, most recently active first (paged via X-Next-Cursor when limit or cursor is given)"""
+    # Sessions with their message counts in one LEFT JOIN ... GROUP BY
+    stmt = (
+        select(models.ChatSession, func.count(models.Conversation.id))
+        .outerjoin(
+            models.Conversation,
+            and_(
+                models.Conversation.session_id == models.ChatSession.id,
+                models.Conversation.user_id == current_user.id
+            )
+        )
+        .where(models.ChatSession.user_id == current_user.id)
+        .group_by(models.ChatSession.id)
+        .order_by(models.ChatSession.last_message_at.desc().nullslast(), models.ChatSession.id.desc())
+    )
+    if cursor:
+        last_message_at, last_id = _decode_cursor(cursor, models.ChatSession.last_message_at)
+        stmt = stmt.where(_keyset_after(
+            models.ChatSession.last_message_at, models.ChatSession.id, last_message_at, last_id, descending=True
+        ))
+    limit = _page_limit(limit, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = (await db.execute(stmt)).all()
+    rows, next_cursor = _page(rows, limit, lambda row: (row[0].last_message_at, row[0].id))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    response = []
-    for session in sessions:
-        # Get message count for each session
-        message_count = db.query(models.Conversation).filter(
-            models.Conversation.user_id == current_user.id,
-            models.Conversation.session_id == session.id
-        ).count()
-        
-        response.append(schemas.SessionResponse(
+    return [
+        schemas.SessionResponse(
             id=session.id,
             name=session.name,
             created_at=session.created_at,
             last_message_at=session.last_message_at,
             message_count=message_count,
             is_active=session.is_active
-        ))
-    
-    return response
+        )
+        for session, message_count in rows
+    ]
 
 
 @app.put("/sessions/{session_id}", response_model=schemas.SessionResponse)
@@ -1398,23 +1705,26 @@ async def update_session(
     db: Session = Depends(get_db)
 ):
     """Update session name or archive"""
-    session = db.query(models.ChatSession).filter(
+    patch = session_data.dict(exclude_none=True)
+    criteria = (
         models.ChatSession.id == session_id,
         models.ChatSession.user_id == current_user.id
-    ).first()
+    )
+    if patch:
+        stmt = (
+            update(models.ChatSession)
+            .where(*criteria)
+            .values(**patch)
+            .returning(models.ChatSession)
+        )
+    else:
+        stmt = select(models.ChatSession).where(*criteria)
+    session = _commit_returning(db, stmt)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    if session_data.name is not None:
-        session.name = session_data.name
-    if session_data.is_active is not None:
-        session.is_active = session_data.is_active
-    
-    db.commit()
-    db.refresh(session)
-    
-    # Get message count
+    # Get message count (renaming or archiving doesn't change it)
     message_count = db.query(models.Conversation).filter(
         models.Conversation.user_id == current_user.id,
         models.Conversation.session_id == session_id
@@ -1431,45 +1741,45 @@ async def update_session(
 
 
 @app.delete("/sessions/{session_id}")
-async def delete_session(
+def delete_session(
     session_id: str,
+    background_tasks: BackgroundTasks,
+    invalidate_overview: Callable[[], None] = Depends(overview_invalidator),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a session and all its conversations"""
-    session = db.query(models.ChatSession).filter(
-        models.ChatSession.id == session_id,
-        models.ChatSession.user_id == current_user.id
-    ).first()
-    
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Delete all conversations in this session
-    conversations = db.query(models.Conversation).filter(
+    # Ids of the session's conversations, removed from the vector store after the response
+    conversation_ids = [conv_id for (conv_id,) in db.query(models.Conversation.id).filter(
         models.Conversation.user_id == current_user.id,
         models.Conversation.session_id == session_id
-    ).all()
+    )]
+    
+    # Deleted explicitly as well as by the ON DELETE CASCADE / SET NULL foreign
+    # keys: databases created before those were declared (SQLite can't alter
+    # constraints) still have plain foreign keys, enforced by PRAGMA foreign_keys
+    if conversation_ids:
+        db.execute(
+            update(models.Commitment)
+            .where(models.Commitment.created_from_conversation_id.in_(conversation_ids))
+            .values(created_from_conversation_id=None)
+        )
+        db.execute(delete(models.Conversation).where(models.Conversation.id.in_(conversation_ids)))
     
-    # Delete from vector store
-    if conversations:
-        try:
-            for conv in conversations:
-                vector_store.conversations_collection.delete(
-                    where={"conversation_id": str(conv.id)}
-                )
-        except Exception as e:
-            debug_logger.log(f"Warning: Could not delete from vector store: {e}")
+    result = db.execute(
+        delete(models.ChatSession).where(
+            models.ChatSession.id == session_id,
+            models.ChatSession.user_id == current_user.id
+        )
+    )
     
-    # Delete conversations from database
-    db.query(models.Conversation).filter(
-        models.Conversation.user_id == current_user.id,
-        models.Conversation.session_id == session_id
-    ).delete()
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    # Delete the session
-    db.delete(session)
     db.commit()
+    invalidate_overview()
+    
+    background_tasks.add_task(vector_store.delete_conversations, conversation_ids)
     
     return {"detail": "Session deleted successfully"}
 
@@ -1488,138 +1798,174 @@ def get_mood_analytics(
     end_date = time_service.now().date()
     start_date = end_date - timedelta(days=days)
     
-    checkins = db.query(models.DailyCheckIn).filter(
+    # Latest check-in per day, ranked in SQL; the average and count of those
+    # daily moods come back on every row as window aggregates
+    checkin_day = func.date(models.DailyCheckIn.timestamp)
+    ranked = select(
+        checkin_day.label("day"),
+        models.DailyCheckIn.mood,
+        models.DailyCheckIn.notes,
+        func.row_number().over(
+            partition_by=checkin_day,
+            order_by=models.DailyCheckIn.timestamp.desc()
+        ).label("rank")
+    ).where(
         models.DailyCheckIn.user_id == current_user.id,
-        cast(models.DailyCheckIn.timestamp, Date) >= start_date,
-        cast(models.DailyCheckIn.timestamp, Date) <= end_date
-    ).order_by(models.DailyCheckIn.timestamp.asc()).all()
-    
-    # Group by date (latest checkin per day)
-    mood_by_date = {}
-    for checkin in checkins:
-        checkin_date = checkin.timestamp.date()
-        if checkin_date not in mood_by_date or checkin.timestamp > mood_by_date[checkin_date]['timestamp']:
-            mood_by_date[checkin_date] = {
-                'mood': checkin.mood,
-                'notes': checkin.notes,
-                'timestamp': checkin.timestamp
-            }
+        checkin_day.between(start_date.isoformat(), end_date.isoformat())
+    ).subquery()
+    latest = db.execute(
+        select(
+            ranked.c.day,
+            ranked.c.mood,
+            ranked.c.notes,
+            func.avg(ranked.c.mood).over().label("average_mood"),
+            func.count(ranked.c.mood).over().label("total_checkins")
+        ).where(ranked.c.rank == 1)
+    ).all()
+    
+    # day is a DATE on Postgres and an ISO string on SQLite
+    mood_by_date = {str(row.day): row for row in latest}
     
     # Create daily data
     daily_moods = []
-    current_date = start_date
-    while current_date <= end_date:
-        mood_data = mood_by_date.get(current_date)
+    for offset in range(days + 1):
+        day = (start_date + timedelta(days=offset)).isoformat()
+        mood_data = mood_by_date.get(day)
         daily_moods.append({
-            "date": current_date.isoformat(),
-            "mood": mood_data['mood'] if mood_data else None,
-            "notes": mood_data['notes'] if mood_data else None
+            "date": day,
+            "mood": mood_data.mood if mood_data else None,
+            "notes": mood_data.notes if mood_data else None
         })
-        current_date += timedelta(days=1)
     
-    # Calculate average mood
-    mood_values = [m['mood'] for m in daily_moods if m['mood'] is not None]
-    average_mood = sum(mood_values) / len(mood_values) if mood_values else None
+    average_mood = latest[0].average_mood if latest else None
     
     return {
         "average_mood": round(average_mood, 1) if average_mood else None,
-        "total_checkins": len(mood_values),
+        "total_checkins": latest[0].total_checkins if latest else 0,
         "daily_moods": daily_moods
     }
 
 @app.get("/analytics/overview")
-def get_overview_analytics(
+async def get_overview_analytics(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Get all commitments counts
-    total_commitments = db.query(func.count(models.Commitment.id)).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.status.in_(["active", "completed"])
-    ).scalar()
+    today = time_service.now().date()
+    cached = _overview_cache.get(current_user.id)
+    if cached is not None and cached[0] == today:
+        return cached[1]
     
-    recurring_commitments = db.query(func.count(models.Commitment.id)).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.recurrence_pattern != "none",
-        models.Commitment.status.in_(["active", "completed"])
-    ).scalar()
-    
-    one_time_commitments = db.query(func.count(models.Commitment.id)).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.recurrence_pattern == "none",
-        models.Commitment.status.in_(["active", "completed"])
-    ).scalar()
+    # Every counter below is a scalar subquery of one SELECT, so the overview
+    # is a single round-trip. correlate(None) keeps the subqueries that touch
+    # commitments from correlating to the outer aggregate over commitments.
     
     # Completed today (both recurring and one-time)
-    today = time_service.now().date()
+    completed_today = (
+        select(func.count(func.distinct(models.CommitmentCompletion.commitment_id)))
+        .join(models.Commitment)
+        .where(
+            models.Commitment.user_id == current_user.id,
+            models.Commitment.recurrence_pattern.is_not(None),
+            models.CommitmentCompletion.completion_date == today,
+            models.CommitmentCompletion.skipped == False
+        )
+        .correlate(None)
+        .scalar_subquery()
+    )
     
-    # Count recurring commitments completed today
-    recurring_completed_today = db.query(
-        func.count(func.distinct(models.CommitmentCompletion.commitment_id))
-    ).join(models.Commitment).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.recurrence_pattern != "none",
-        models.CommitmentCompletion.completion_date == today,
-        models.CommitmentCompletion.skipped == False
-    ).scalar()
-    
-    # Count one-time commitments completed today
-    one_time_completed_today = db.query(
-        func.count(func.distinct(models.CommitmentCompletion.commitment_id))
-    ).join(models.Commitment).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.recurrence_pattern == "none",
-        models.CommitmentCompletion.completion_date == today,
-        models.CommitmentCompletion.skipped == False
-    ).scalar()
+    # Current mood (today's latest checkin)
+    current_mood = (
+        select(models.DailyCheckIn.mood).where(
+            models.DailyCheckIn.user_id == current_user.id,
+            func.date(models.DailyCheckIn.timestamp) == today.isoformat()
+        ).order_by(models.DailyCheckIn.timestamp.desc()).limit(1)
+        .scalar_subquery()
+    )
     
-    completed_today = recurring_completed_today + one_time_completed_today
+    # Longest streak of any activity over the last year, as a gaps-and-islands
+    # query: consecutive days share the same (day number - row number) group
+    completion_days = (
+        select(models.CommitmentCompletion.completion_date.label("day"))
+        .join(models.Commitment)
+        .where(
+            models.Commitment.user_id == current_user.id,
+            models.Commitment.recurrence_pattern != "none",
+            models.CommitmentCompletion.skipped == False,
+            models.CommitmentCompletion.completion_date.between(today - timedelta(days=364), today)
+        )
+        .distinct()
+        .subquery()
+    )
+    streak_groups = select(
+        (day_number(completion_days.c.day) - func.row_number().over(order_by=completion_days.c.day)).label("grp")
+    ).subquery()
+    streak_lengths = (
+        select(func.count().label("length"))
+        .select_from(streak_groups)
+        .group_by(streak_groups.c.grp)
+        .subquery()
+    )
+    longest_streak = select(func.coalesce(func.max(streak_lengths.c.length), 0)).correlate(None).scalar_subquery()
     
-    # Current mood (today's latest checkin)
-    today_checkin = db.query(models.DailyCheckIn).filter(
-        models.DailyCheckIn.user_id == current_user.id,
-        func.date(models.DailyCheckIn.timestamp) == today.isoformat()
-    ).order_by(models.DailyCheckIn.timestamp.desc()).first()
+    total_conversations = (
+        select(func.count(models.Conversation.id))
+        .where(models.Conversation.user_id == current_user.id)
+        .scalar_subquery()
+    )
     
-    # Longest streak calculation - simplified for unified system
-    # Get all completions for recurring commitments
-    all_completions = db.query(models.CommitmentCompletion).join(models.Commitment).filter(
-        models.Commitment.user_id == current_user.id,
-        models.Commitment.recurrence_pattern != "none",
-        models.CommitmentCompletion.skipped == False
-    ).order_by(models.CommitmentCompletion.completion_date.desc()).limit(365).all()
-    
-    # Calculate longest streak of any activity
-    completion_days = set()
-    for completion in all_completions:
-        completion_days.add(completion.completion_date)
-    
-    longest_streak = 0
-    current_streak = 0
-    check_date = date.today()
-    
-    for i in range(365):  # Check last year
-        if check_date in completion_days:
-            current_streak += 1
-            longest_streak = max(longest_streak, current_streak)
-        else:
-            current_streak = 0
-        check_date -= timedelta(days=1)
+    # Commitment counts in one pass over the user's commitments, plus the above
+    (
+        total_commitments, recurring_commitments, one_time_commitments,
+        completed_today, current_mood, longest_streak, total_conversations
+    ) = (await db.execute(
+        select(
+            func.count(models.Commitment.id),
+            func.count(models.Commitment.id).filter(models.Commitment.recurrence_pattern != "none"),
+            func.count(models.Commitment.id).filter(models.Commitment.recurrence_pattern == "none"),
+            completed_today,
+            current_mood,
+            longest_streak,
+            total_conversations
+        ).where(
+            models.Commitment.user_id == current_user.id,
+            models.Commitment.status.in_(["active", "completed"])
+        )
+    )).one()
     
-    return {
+    overview = {
         "total_commitments": total_commitments,
         "recurring_commitments": recurring_commitments,
         "one_time_commitments": one_time_commitments,
         "completed_today": completed_today,
         "completion_rate": round((completed_today / total_commitments) * 100, 1) if total_commitments > 0 else 0,
-        "current_mood": today_checkin.mood if today_checkin else None,
+        "current_mood": current_mood,
         "longest_streak": longest_streak,
-        "total_conversations": db.query(func.count(models.Conversation.id)).filter(
-            models.Conversation.user_id == current_user.id
-        ).scalar(),
+        "total_conversations": total_conversations,
         # Keep old field for backward compatibility
         "total_habits": recurring_commitments
     }
+    _overview_cache[current_user.id] = (today, overview)
+    return overview
+
+@app.get("/dashboard", response_model=schemas.DashboardResponse)
+async def get_dashboard(current_user: models.User = Depends(get_current_user)):
+    """Commitments, overview analytics and scheduled prompts in one request.
+
+    Each part runs on its own async session (an AsyncSession can't run
+    statements concurrently) so the three are fetched in parallel.
+    """
+    async def run(handler):
+        async with AsyncSessionLocal() as session:
+            return await handler(current_user=current_user, db=session)
+    
+    (commitments, _), overview, scheduled_prompts = await asyncio.gather(
+        run(_commitment_page), run(get_overview_analytics), run(get_scheduled_prompts)
+    )
+    return {
+        "commitments": commitments,
+        "overview": overview,
+        "scheduled_prompts": scheduled_prompts
+    }
 
 @app.get("/analytics/commitments")
 def get_commitments_analytics(
@@ -1627,80 +1973,100 @@ def get_commitments_analytics(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get analytics for commitments over a specified time period"""
+    """Get analytics for commitments over a specified time period.
+
+    The response is streamed one commitment at a time, so the per-day
+    buckets for every commitment are never held in memory all at once.
+    """
     # Get date range
     end_date = time_service.now().date()
     start_date = end_date - timedelta(days=days)
     
-    # Get all active commitments for the user
-    commitments = db.query(models.Commitment).filter(
+    # Get all active commitments for the user (only the columns we report)
+    commitment_filter = (
         models.Commitment.user_id == current_user.id,
         models.Commitment.status.in_(["active", "completed"])
-    ).all()
-    
-    analytics_data = []
-    
-    for commitment in commitments:
-        # Get completions for this commitment in the date range
-        completions = db.query(models.CommitmentCompletion).filter(
-            models.CommitmentCompletion.commitment_id == commitment.id,
+    )
+    commitments = db.query(
+        models.Commitment.id,
+        models.Commitment.task_description,
+        models.Commitment.recurrence_pattern
+    ).filter(*commitment_filter).all()
+    
+    # Per-commitment, per-day completion counts in a single grouped query. The
+    # commitments are matched by join rather than an IN list of their ids, so
+    # the statement doesn't grow (or hit SQLite's bound-parameter limit) with
+    # the number of commitments.
+    daily_counts = defaultdict(dict)
+    if commitments:
+        rows = db.query(
+            models.CommitmentCompletion.commitment_id,
+            models.CommitmentCompletion.completion_date,
+            func.count(models.CommitmentCompletion.id)
+        ).join(models.Commitment).filter(
+            *commitment_filter,
             models.CommitmentCompletion.completion_date >= start_date,
             models.CommitmentCompletion.completion_date <= end_date,
             models.CommitmentCompletion.skipped == False
+        ).group_by(
+            models.CommitmentCompletion.commitment_id,
+            models.CommitmentCompletion.completion_date
         ).all()
-        
-        # Create daily data array
-        daily_data = []
-        current_date = start_date
-        while current_date <= end_date:
-            completed_count = len([c for c in completions if c.completion_date == current_date])
-            daily_data.append({
-                "date": current_date.isoformat(),
-                "completed": completed_count
-            })
-            current_date += timedelta(days=1)
+        for commitment_id, completion_date, count in rows:
+            daily_counts[commitment_id][completion_date] = count
+    
+    # Date buckets are the same for every commitment, so build them once
+    # (orjson writes the date objects as ISO strings itself)
+    date_range = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+    
+    def build_entry(commitment):
+        counts = daily_counts.get(commitment.id, {})
+        daily_data = [{"date": d, "completed": counts.get(d, 0)} for d in date_range]
+        total_completions = sum(counts.values())
         
         # Calculate completion rate
         if commitment.recurrence_pattern != "none":
             # For recurring commitments, calculate based on expected vs actual completions
             total_expected_days = days
-            total_completions = len(completions)
             completion_rate = (total_completions / total_expected_days) * 100 if total_expected_days > 0 else 0
         else:
             # For one-time commitments, it's either 0% or 100%
-            total_completions = len(completions)
             completion_rate = 100.0 if total_completions > 0 else 0.0
         
-        analytics_data.append({
+        return {
             "commitment_id": commitment.id,
             "commitment_name": commitment.task_description,
             "completion_rate": round(completion_rate, 1),
-            "total_completions": len(completions),
+            "total_completions": total_completions,
             "total_days": days,
             "recurrence_pattern": commitment.recurrence_pattern,
             "is_recurring": commitment.recurrence_pattern != "none",
             "daily_data": daily_data
-        })
+        }
+    
+    def stream_entries():
+        yield b"["
+        for index, commitment in enumerate(commitments):
+            if index:
+                yield b","
+            yield orjson.dumps(build_entry(commitment))
+        yield b"]"
     
-    return analytics_data
+    return StreamingResponse(stream_entries(), media_type="application/json")
 
 # Debug API endpoints for time acceleration testing
 @app.post("/debug/time/start")
 def start_fake_time(
-    fake_start_time: str = None,  # ISO format datetime string
-    time_multiplier: int = 600,
+    start_request: Optional[schemas.FakeTimeStartRequest] = None,
     current_user: models.User = Depends(get_current_user)
 ):
     """Start fake time acceleration for testing proactive AI features"""
+    start_request = start_request or schemas.FakeTimeStartRequest()
     try:
-        start_datetime = None
-        if fake_start_time:
-            start_datetime = datetime.fromisoformat(fake_start_time.replace('Z', '+00:00'))
-        
-        result = time_service.start_fake_time(start_datetime, time_multiplier)
+        result = time_service.start_fake_time(start_request.fake_start_time, start_request.time_multiplier)
         return {
             "success": True,
-            "message": f"Fake time started with {time_multiplier}x acceleration",
+            "message": f"Fake time started with {start_request.time_multiplier}x acceleration",
             **result
         }
     except Exception as e:
@@ -1745,16 +2111,15 @@ def set_time_multiplier(
 
 @app.post("/debug/time/jump")
 def jump_to_time(
-    target_time: str,  # ISO format datetime string
+    jump_request: schemas.TimeJumpRequest,
     current_user: models.User = Depends(get_current_user)
 ):
     """Jump fake time to a specific datetime"""
     try:
-        target_datetime = datetime.fromisoformat(target_time.replace('Z', '+00:00'))
-        result = time_service.jump_to_time(target_datetime)
+        result = time_service.jump_to_time(jump_request.target_time)
         return {
             "success": True,
-            "message": f"Jumped to fake time: {target_time}",
+            "message": f"Jumped to fake time: {jump_request.target_time.isoformat()}",
             **result
         }
     except Exception as e:
@@ -1783,6 +2148,14 @@ def get_debug_status(current_user: models.User = Depends(get_current_user)):
     """Get current debug configuration status"""
     return debug_logger.get_debug_status()
 
+@app.get("/debug/db/pool")
+def get_db_pool_status(current_user: models.User = Depends(get_current_user)):
+    """Get database connection pool usage"""
+    return {
+        "success": True,
+        "pools": get_pool_status()
+    }
+
 @app.get("/debug/pipeline/recent-executions")
 def get_recent_pipeline_executions(current_user: models.User = Depends(get_current_user)):
     """Get recent pipeline execution details"""
@@ -1850,7 +2223,7 @@ def get_last_pipeline_execution(current_user: models.User = Depends(get_current_
         
         return {
             "success": True,
-            "last_execution": recent_executions[0]  # Most recent execution
+            "last_execution": recent_executions[-1]  # Most recent execution
         }
     except Exception as e:
         return {
@@ -1863,7 +2236,7 @@ def clear_debug_logs(current_user: models.User = Depends(get_current_user)):
     """Clear recent pipeline execution logs"""
     try:
         # Clear recent executions
-        debug_logger.recent_executions = []
+        debug_logger.recent_executions.clear()
         
         return {
             "success": True,
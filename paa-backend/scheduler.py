@@ -2,16 +2,25 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import exists, insert, select, update, or_
 from datetime import datetime, timedelta, date, time as time_obj
-from database import SessionLocal, Commitment, ProactiveMessage, ScheduledPrompt, User
+from typing import Iterator, List, Optional
+from database import SessionLocal, AsyncSessionLocal, Commitment, ProactiveMessage, ScheduledPrompt, User
+from contextlib import contextmanager
+from functools import lru_cache
+import asyncio
 import logging
+import os
 
 # Import time service for fake time support
+@lru_cache(maxsize=1)
 def get_time_service():
     """Lazy import to avoid circular imports"""
     from services.time_service import time_service
     return time_service
 
+@lru_cache(maxsize=1)
 def get_fake_time_scheduler():
     """Lazy import to avoid circular imports"""
     from services.fake_time_scheduler import fake_time_scheduler
@@ -24,30 +33,76 @@ logger = logging.getLogger(__name__)
 # Global scheduler instance
 scheduler = AsyncIOScheduler()
 
-def get_db() -> Session:
-    """Get database session for scheduler jobs"""
-    db = SessionLocal()
+# Scheduled prompts are sent within this long either side of their schedule_time
+PROMPT_WINDOW = timedelta(minutes=5)
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+# Overdue commitments are streamed and reminded this many at a time
+REMINDER_BATCH_SIZE = 200
+
+# Default prompts seeded for every new user
+DEFAULT_WORK_CHECKIN = dict(
+    prompt_type="work_checkin",
+    schedule_time=time_obj(17, 0),  # 5:00 PM
+    schedule_days="monday,tuesday,wednesday,thursday,friday",
+    prompt_template="Hope work wrapped up well today! How was it? Want to chat about anything?",
+    is_active=True
+)
+DEFAULT_WEEKEND_REFLECTION = dict(
+    prompt_type="weekend_reflection",
+    schedule_time=time_obj(18, 0),  # 6:00 PM
+    schedule_days="sunday",
+    prompt_template="How was your weekend? Ready for the week ahead?",
+    is_active=True
+)
+
+def schedule_days_mask(schedule_days: str) -> int:
+    """Bitmask of the weekdays named in a schedule_days CSV (bit 0 = Monday ... bit 6 = Sunday)"""
+    names = {name.strip() for name in (schedule_days or "").lower().split(",")}
+    return sum(1 << index for index, name in enumerate(WEEKDAYS) if name in names)
+
+def next_prompt_due_at(schedule_time: time_obj, schedule_days: str, after: datetime) -> Optional[datetime]:
+    """When a prompt is next due: schedule_time on the first scheduled day whose send window is still open at `after`"""
+    days_mask = schedule_days_mask(schedule_days)
+    if not days_mask or schedule_time is None:
+        return None
+    for offset in range(8):
+        day = after.date() + timedelta(days=offset)
+        due_at = datetime.combine(day, schedule_time)
+        if days_mask & (1 << day.weekday()) and due_at + PROMPT_WINDOW >= after:
+            return due_at
+    return None
+
+def schedule_next_prompt(prompt: ScheduledPrompt, now: datetime):
+    """Set prompt.next_due_at from `now` (from tomorrow if the prompt was already sent today)"""
+    after = now
+    if prompt.last_sent_at is not None and prompt.last_sent_at.date() >= now.date():
+        after = datetime.combine(now.date() + timedelta(days=1), time_obj.min)
+    prompt.next_due_at = next_prompt_due_at(prompt.schedule_time, prompt.schedule_days, after)
+
+@contextmanager
+def scoped_session() -> Iterator[Session]:
+    """Sync database session for scheduler work run in a thread, closed when done.
+
+    Callers never need rows re-read after committing, so commits don't expire
+    loaded objects (like AsyncSessionLocal, which the scheduled jobs use).
+    """
+    db = SessionLocal(expire_on_commit=False)
     try:
-        return db
+        yield db
     finally:
-        pass  # Session will be closed in the job functions
+        db.close()
 
-async def send_proactive_message(user_id: int, content: str, message_type: str, related_commitment_id: int = None):
-    """Send a proactive message to the user"""
-    db = get_db()
+async def send_proactive_message(db: AsyncSession, user_id: int, content: str, message_type: str, related_commitment_id: int = None):
+    """Send a proactive message to the user, on the caller's async session"""
     try:
-        # Create proactive message record
-        proactive_msg = ProactiveMessage(
-            user_id=user_id,
-            message_type=message_type,
-            content=content,
-            related_commitment_id=related_commitment_id,
-            sent_at=get_time_service().now()
-        )
-        db.add(proactive_msg)
-        db.commit()
-        
-        logger.info(f"Sent proactive message to user {user_id}: {message_type}")
+        # Create proactive message record (a Core INSERT, no ORM object needed)
+        await db.run_sync(send_proactive_messages, [{
+            "user_id": user_id,
+            "message_type": message_type,
+            "content": content,
+            "related_commitment_id": related_commitment_id
+        }], get_time_service().now())
+        await db.commit()
         
         # In a real implementation, you would also:
         # - Send push notification
@@ -56,194 +111,191 @@ async def send_proactive_message(user_id: int, content: str, message_type: str,
         
     except Exception as e:
         logger.error(f"Error sending proactive message: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        await db.rollback()
+
+def send_proactive_messages(db: Session, messages: List[dict], sent_at: datetime):
+    """Record a batch of proactive messages with a single INSERT (the caller commits).
+
+    Each message is a dict of ProactiveMessage fields (user_id, content,
+    message_type and optionally related_commitment_id). sent_at is the
+    calling job's tick time.
+    """
+    if not messages:
+        return
+    db.execute(insert(ProactiveMessage), [{**message, "sent_at": sent_at} for message in messages])
+    for message in messages:
+        logger.info(f"Sent proactive message to user {message['user_id']}: {message['message_type']}")
+
+def overdue_commitments_query(now: datetime):
+    """Overdue commitments that need a reminder (not too frequent), just the columns the reminder job uses.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED so concurrent workers on
+    Postgres never remind the same commitment twice (SQLite ignores it; see
+    SCHEDULER_LEADER).
+    """
+    # For fake time testing, use shorter intervals
+    min_interval = timedelta(minutes=30)  # 30 minutes instead of 24 hours for testing
+    return select(
+        Commitment.id,
+        Commitment.user_id,
+        Commitment.task_description,
+        Commitment.reminder_count
+    ).where(
+        Commitment.status == "pending",
+        Commitment.deadline < now,  # Compare datetime to datetime
+        Commitment.reminder_count < 2,  # Max 2 reminders to avoid being annoying
+        or_(
+            Commitment.last_reminded_at.is_(None),
+            Commitment.last_reminded_at < now - min_interval
+        )
+    ).with_for_update(skip_locked=True)
 
 async def check_commitment_reminders():
     """Check for overdue commitments and send reminders"""
-    db = get_db()
-    try:
-        now = get_time_service().now()
-        today = get_time_service().now().date()
-        
-        # Find overdue commitments that need reminders
-        overdue_commitments = db.query(Commitment).filter(
-            Commitment.status == "pending",
-            Commitment.deadline < now,  # Compare datetime to datetime
-            Commitment.reminder_count < 2  # Max 2 reminders to avoid being annoying
-        ).all()
-        
-        for commitment in overdue_commitments:
-            # Check if we should send a reminder (not too frequent)
-            # For fake time testing, use shorter intervals
-            min_interval = 30 * 60  # 30 minutes instead of 24 hours for testing
-            if commitment.last_reminded_at is None or \
-               (now - commitment.last_reminded_at).total_seconds() > min_interval:
+    async with AsyncSessionLocal() as db:
+        try:
+            now = get_time_service().now()
+            
+            overdue_commitments = await db.stream(
+                overdue_commitments_query(now).execution_options(yield_per=REMINDER_BATCH_SIZE)
+            )
+            
+            # Rows are streamed and each batch's reminders are written together
+            async for batch in overdue_commitments.partitions():
+                messages = []
+                for commitment in batch:
+                    if commitment.reminder_count == 0:
+                        # First follow-up: gentle check-in
+                        message = f"You mentioned {commitment.task_description}. How did it go?"
+                    else:
+                        # Second follow-up: encouraging retry
+                        message = f"Looks like {commitment.task_description} might have gotten away from you. Want to try again today?"
+                    
+                    messages.append({
+                        "user_id": commitment.user_id,
+                        "content": message,
+                        "message_type": "commitment_reminder",
+                        "related_commitment_id": commitment.id
+                    })
                 
-                if commitment.reminder_count == 0:
-                    # First follow-up: gentle check-in
-                    message = f"You mentioned {commitment.task_description}. How did it go?"
-                elif commitment.reminder_count == 1:
-                    # Second follow-up: encouraging retry
-                    message = f"Looks like {commitment.task_description} might have gotten away from you. Want to try again today?"
+                await db.run_sync(send_proactive_messages, messages, now)
                 
-                await send_proactive_message(
-                    user_id=commitment.user_id,
-                    content=message,
-                    message_type="commitment_reminder",
-                    related_commitment_id=commitment.id
+                # Update commitments
+                await db.execute(
+                    update(Commitment)
+                    .where(Commitment.id.in_([commitment.id for commitment in batch]))
+                    .values(reminder_count=Commitment.reminder_count + 1, last_reminded_at=now)
                 )
-                
-                # Update commitment
-                commitment.reminder_count += 1
-                commitment.last_reminded_at = get_time_service().now()
-                db.commit()
-                
-    except Exception as e:
-        logger.error(f"Error checking commitment reminders: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            await db.commit()
+                    
+        except Exception as e:
+            logger.error(f"Error checking commitment reminders: {e}")
+            await db.rollback()
+
+def due_prompts_query(now: datetime):
+    """Active scheduled prompts whose send window is open at `now`.
+
+    An index range scan on next_due_at instead of checking every active prompt.
+    Like overdue_commitments_query, rows are claimed with FOR UPDATE SKIP LOCKED
+    so concurrent workers on Postgres send each prompt once.
+    """
+    return select(ScheduledPrompt).where(
+        ScheduledPrompt.is_active == True,
+        ScheduledPrompt.next_due_at.between(now - PROMPT_WINDOW, now + PROMPT_WINDOW)
+    ).with_for_update(skip_locked=True)
 
 async def send_scheduled_prompts():
     """Send scheduled prompts like work check-ins"""
-    db = get_db()
-    try:
-        now = get_time_service().now()
-        current_time = now.time()
-        current_day = now.strftime("%A").lower()  # monday, tuesday, etc.
-        
-        # Find scheduled prompts that should be sent now
-        scheduled_prompts = db.query(ScheduledPrompt).filter(
-            ScheduledPrompt.is_active == True
-        ).all()
-        
-        for prompt in scheduled_prompts:
-            # Check if today is a scheduled day
-            if current_day in prompt.schedule_days.lower():
-                # Check if it's time to send (within 5 minutes of scheduled time)
-                scheduled_time = prompt.schedule_time
-                time_diff = abs(
-                    (current_time.hour * 60 + current_time.minute) - 
-                    (scheduled_time.hour * 60 + scheduled_time.minute)
-                )
-                
-                if time_diff <= 5:  # Within 5 minutes
-                    # Check if we already sent today
-                    if prompt.last_sent_at is None or \
-                       prompt.last_sent_at.date() < now.date():
-                        
-                        await send_proactive_message(
-                            user_id=prompt.user_id,
-                            content=prompt.prompt_template,
-                            message_type="scheduled_prompt"
-                        )
-                        
-                        # Update last sent time
-                        prompt.last_sent_at = get_time_service().now()
-                        db.commit()
-                        
-    except Exception as e:
-        logger.error(f"Error sending scheduled prompts: {e}")
-        db.rollback()
-    finally:
-        db.close()
-
-async def initialize_default_prompts_for_user(user_id: int):
-    """Initialize default scheduled prompts for a new user (async version)"""
-    db = get_db()
-    try:
-        # Check if user already has prompts
-        existing_prompts = db.query(ScheduledPrompt).filter(
-            ScheduledPrompt.user_id == user_id
-        ).first()
-        
-        if not existing_prompts:
-            # Create default work check-in prompt
-            work_checkin = ScheduledPrompt(
-                user_id=user_id,
-                prompt_type="work_checkin",
-                schedule_time=time_obj(17, 0),  # 5:00 PM
-                schedule_days="monday,tuesday,wednesday,thursday,friday",
-                prompt_template="Hope work wrapped up well today! How was it? Want to chat about anything?",
-                is_active=True
-            )
+    async with AsyncSessionLocal() as db:
+        try:
+            now = get_time_service().now()
             
-            # Create default weekend reflection prompt
-            weekend_reflection = ScheduledPrompt(
-                user_id=user_id,
-                prompt_type="weekend_reflection",
-                schedule_time=time_obj(18, 0),  # 6:00 PM
-                schedule_days="sunday",
-                prompt_template="How was your weekend? Ready for the week ahead?",
-                is_active=True
-            )
+            # Roll forward prompts whose window closed unsent (e.g. while the server
+            # was down or fake time jumped) and ones never scheduled
+            stale_prompts = await db.scalars(select(ScheduledPrompt).where(
+                ScheduledPrompt.is_active == True,
+                or_(ScheduledPrompt.next_due_at.is_(None), ScheduledPrompt.next_due_at < now - PROMPT_WINDOW)
+            ).with_for_update(skip_locked=True))
+            for prompt in stale_prompts:
+                schedule_next_prompt(prompt, now)
+            await db.commit()
             
-            db.add(work_checkin)
-            db.add(weekend_reflection)
-            db.commit()
+            scheduled_prompts = (await db.scalars(due_prompts_query(now))).all()
             
-            logger.info(f"Initialized default prompts for user {user_id}")
+            await db.run_sync(send_proactive_messages, [
+                {"user_id": prompt.user_id, "content": prompt.prompt_template, "message_type": "scheduled_prompt"}
+                for prompt in scheduled_prompts
+            ], now)
             
-    except Exception as e:
-        logger.error(f"Error initializing default prompts: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            for prompt in scheduled_prompts:
+                # Update last sent time and move on to the next scheduled day
+                prompt.last_sent_at = now
+                schedule_next_prompt(prompt, now)
+            await db.commit()
+                            
+        except Exception as e:
+            logger.error(f"Error sending scheduled prompts: {e}")
+            await db.rollback()
+
+async def initialize_default_prompts_for_user(user_id: int):
+    """Initialize default scheduled prompts for a new user (async version)"""
+    await asyncio.to_thread(initialize_default_prompts_for_user_sync, user_id)
 
 def initialize_default_prompts_for_user_sync(user_id: int):
     """Initialize default scheduled prompts for a new user (synchronous version)"""
-    db = get_db()
-    try:
-        # Check if user already has prompts
-        existing_prompts = db.query(ScheduledPrompt).filter(
-            ScheduledPrompt.user_id == user_id
-        ).first()
-        
-        if not existing_prompts:
-            # Create default work check-in prompt
-            work_checkin = ScheduledPrompt(
-                user_id=user_id,
-                prompt_type="work_checkin",
-                schedule_time=time_obj(17, 0),  # 5:00 PM
-                schedule_days="monday,tuesday,wednesday,thursday,friday",
-                prompt_template="Hope work wrapped up well today! How was it? Want to chat about anything?",
-                is_active=True
-            )
-            
-            # Create default weekend reflection prompt
-            weekend_reflection = ScheduledPrompt(
-                user_id=user_id,
-                prompt_type="weekend_reflection",
-                schedule_time=time_obj(18, 0),  # 6:00 PM
-                schedule_days="sunday",
-                prompt_template="How was your weekend? Ready for the week ahead?",
-                is_active=True
-            )
+    with scoped_session() as db:
+        try:
+            # Check if user already has prompts
+            has_prompts = db.query(
+                exists().where(ScheduledPrompt.user_id == user_id)
+            ).scalar()
             
-            db.add(work_checkin)
-            db.add(weekend_reflection)
-            db.commit()
-            
-            logger.info(f"Initialized default prompts for user {user_id}")
-            
-    except Exception as e:
-        logger.error(f"Error initializing default prompts: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            if not has_prompts:
+                # Create default work check-in and weekend reflection prompts
+                work_checkin = ScheduledPrompt(user_id=user_id, **DEFAULT_WORK_CHECKIN)
+                weekend_reflection = ScheduledPrompt(user_id=user_id, **DEFAULT_WEEKEND_REFLECTION)
+                
+                now = get_time_service().now()
+                for prompt in (work_checkin, weekend_reflection):
+                    schedule_next_prompt(prompt, now)
+                
+                # Both rows go out in a single multi-row INSERT
+                db.add_all([work_checkin, weekend_reflection])
+                db.commit()
+                
+                logger.info(f"Initialized default prompts for user {user_id}")
+                
+        except Exception as e:
+            logger.error(f"Error initializing default prompts: {e}")
+            db.rollback()
 
 async def start_scheduler():
     """Start the background scheduler (both real and fake time schedulers)"""
     try:
+        # In development, have asyncio log any callback, request or job step that
+        # blocks the event loop (e.g. a synchronous DB call) for more than 100ms.
+        # Set on every worker, before the leader check below
+        if os.getenv("DEBUG_EVENT_LOOP", "false").lower() == "true":
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = 0.1
+        
+        # Every worker process runs its own scheduler; with several workers on
+        # SQLite (no row locking) set SCHEDULER_LEADER=false on all but one
+        if os.getenv("SCHEDULER_LEADER", "true").lower() != "true":
+            logger.info("Scheduler not started: this worker is not the scheduler leader")
+            return
+        
         # Start the regular APScheduler for real time
         # Schedule commitment reminder checks every hour
         scheduler.add_job(
             check_commitment_reminders,
             CronTrigger(minute=0),  # Top of every hour
             id="commitment_reminders",
-            replace_existing=True
+            replace_existing=True,
+            coalesce=True,  # Collapse missed runs into one
+            max_instances=1,
+            misfire_grace_time=300
         )
         
         # Schedule prompt checks every 5 minutes
@@ -251,7 +303,10 @@ async def start_scheduler():
             send_scheduled_prompts,
             IntervalTrigger(minutes=5),
             id="scheduled_prompts",
-            replace_existing=True
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=120
         )
         
         # Only start if not already running
@@ -305,4 +360,4 @@ async def stop_scheduler():
         logger.error(f"Error stopping schedulers: {e}")
 
 # Expose the scheduler instance for external access
-__all__ = ["scheduler", "start_scheduler", "stop_scheduler", "initialize_default_prompts_for_user", "initialize_default_prompts_for_user_sync", "send_proactive_message"]
\ No newline at end of file
+__all__ = ["scheduler", "start_scheduler", "stop_scheduler", "initialize_default_prompts_for_user", "initialize_default_prompts_for_user_sync", "send_proactive_message", "send_proactive_messages", "schedule_next_prompt"]
\ No newline at end of file
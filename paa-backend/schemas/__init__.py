@@ -27,8 +27,10 @@ from .base import (
     ProactiveMessageBase, ProactiveMessageCreate, ProactiveMessageResponse, ProactiveMessage,
     # ScheduledPrompt schemas
     ScheduledPromptBase, ScheduledPromptCreate, ScheduledPromptUpdate, ScheduledPrompt,
+    # Dashboard schemas
+    DashboardResponse,
     # Debug schemas
-    TimeMultiplierRequest, FakeTimeStartRequest
+    TimeMultiplierRequest, FakeTimeStartRequest, TimeJumpRequest
 )
 
 # Import all AI response schemas
@@ -60,7 +62,8 @@ __all__ = [
     'CommitmentCompletionBase', 'CommitmentCompletionCreate', 'CommitmentCompletion',
     'ProactiveMessageBase', 'ProactiveMessageCreate', 'ProactiveMessageResponse', 'ProactiveMessage',
     'ScheduledPromptBase', 'ScheduledPromptCreate', 'ScheduledPromptUpdate', 'ScheduledPrompt',
-    'TimeMultiplierRequest', 'FakeTimeStartRequest',
+    'DashboardResponse',
+    'TimeMultiplierRequest', 'FakeTimeStartRequest', 'TimeJumpRequest',
     # AI Response schemas
     'MessageIntent',
     'ReminderStrategy',
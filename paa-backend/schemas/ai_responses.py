@@ -8,6 +8,21 @@ from datetime import datetime, date
 from typing import List, Dict, Literal, Optional, Any
 
 
+# Entity buckets extracted from a message
+ENTITY_TYPES = (
+    'people',           # ["mom", "John"]
+    'habits',           # ["workout", "meditate"]
+    'time_references',  # ["tomorrow", "last week"]
+    'emotions',         # ["anxious", "happy"]
+    'actions'           # ["call", "worked out"]
+)
+
+
+def _empty_entities() -> Dict[str, List[str]]:
+    """A fresh empty list per entity type"""
+    return {entity_type: [] for entity_type in ENTITY_TYPES}
+
+
 # Intent Classification Schema
 class MessageIntent(BaseModel):
     """First stage: Understand what the user wants"""
@@ -22,13 +37,7 @@ class MessageIntent(BaseModel):
     
     secondary_intents: List[str] = Field(default_factory=list)  # Multiple intents possible
     
-    entities: Dict[str, List[str]] = Field(default_factory=lambda: {
-        'people': [],          # ["mom", "John"]
-        'habits': [],          # ["workout", "meditate"]
-        'time_references': [], # ["tomorrow", "last week"]
-        'emotions': [],        # ["anxious", "happy"]
-        'actions': []          # ["call", "worked out"]
-    })
+    entities: Dict[str, List[str]] = Field(default_factory=_empty_entities)
     
     context_needed: List[Literal[
         'recent_conversations',
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel, ConfigDict
 from datetime import datetime, date, time
-from typing import Optional, List
+from typing import Annotated, Any, Dict, Optional, List
 
 # User schemas
 class UserBase(BaseModel):
@@ -14,8 +14,7 @@ class User(UserBase):
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Habit schemas
 class HabitBase(BaseModel):
@@ -34,8 +33,7 @@ class Habit(HabitBase):
     completed_today: bool = False
     current_streak: int = 0
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Chat schemas
 class ChatMessage(BaseModel):
@@ -84,8 +82,7 @@ class DailyCheckIn(DailyCheckInCreate):
     user_id: int
     timestamp: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Person schemas
 class PersonBase(BaseModel):
@@ -106,8 +103,7 @@ class Person(PersonBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # UserProfile schemas
 class UserProfileBase(BaseModel):
@@ -128,8 +124,7 @@ class UserProfile(UserProfileBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Analytics schemas
 class HabitAnalytics(BaseModel):
@@ -184,8 +179,7 @@ class Commitment(CommitmentBase):
     is_recurring: bool = False
     completed_today: bool = False
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Commitment completion schemas
 class CommitmentCompletionBase(BaseModel):
@@ -203,8 +197,7 @@ class CommitmentCompletion(CommitmentCompletionBase):
     completed_at: datetime
     completion_date: date
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ProactiveMessage schemas
 class ProactiveMessageBase(BaseModel):
@@ -227,14 +220,19 @@ class ProactiveMessage(ProactiveMessageBase):
     user_responded: bool
     response_content: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ScheduledPrompt schemas
+def _normalize_schedule_days(value: str) -> str:
+    """Lower-case, space-free day list, so the scheduler can match it as written"""
+    return ",".join(day.strip() for day in value.lower().split(","))
+
+ScheduleDays = Annotated[str, AfterValidator(_normalize_schedule_days)]
+
 class ScheduledPromptBase(BaseModel):
     prompt_type: str  # work_checkin, morning_motivation, evening_reflection
     schedule_time: time
-    schedule_days: str  # "monday,tuesday,wednesday,thursday,friday"
+    schedule_days: ScheduleDays  # "monday,tuesday,wednesday,thursday,friday"
     prompt_template: str
     is_active: bool = True
 
@@ -244,7 +242,7 @@ class ScheduledPromptCreate(ScheduledPromptBase):
 class ScheduledPromptUpdate(BaseModel):
     prompt_type: Optional[str] = None
     schedule_time: Optional[time] = None
-    schedule_days: Optional[str] = None
+    schedule_days: Optional[ScheduleDays] = None
     prompt_template: Optional[str] = None
     is_active: Optional[bool] = None
 
@@ -254,8 +252,13 @@ class ScheduledPrompt(ScheduledPromptBase):
     last_sent_at: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Dashboard schema (commitments, overview and prompts in one response)
+class DashboardResponse(BaseModel):
+    commitments: List[Commitment]
+    overview: Dict[str, Any]
+    scheduled_prompts: List[ScheduledPrompt]
 
 # Debug schemas
 class TimeMultiplierRequest(BaseModel):
@@ -263,4 +266,7 @@ class TimeMultiplierRequest(BaseModel):
 
 class FakeTimeStartRequest(BaseModel):
     time_multiplier: int = 600
-    fake_start_time: Optional[str] = None
\ No newline at end of file
+    fake_start_time: Optional[datetime] = None
+
+class TimeJumpRequest(BaseModel):
+    target_time: datetime
\ No newline at end of file
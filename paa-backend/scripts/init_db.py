@@ -0,0 +1,9 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import engine, init_db
+
+if __name__ == "__main__":
+    init_db()
+    print(f"Database schema is up to date ({engine.url.render_as_string(hide_password=True)})")
@@ -9,7 +9,7 @@ import os
 from datetime import datetime, date
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, inspect, or_, select
 
 from schemas.ai_responses import (
     StructuredAIResponse, ExtractedCommitment, HabitAction,
@@ -28,6 +28,33 @@ from debug_logger import debug_logger
 logger = logging.getLogger(__name__)
 
 
+async def _fetch_all(stmt) -> list:
+    """Run a read-only SELECT on a dedicated async session.
+
+    An AsyncSession can't run statements concurrently, so each lookup gets its
+    own session (and pool connection) and callers can asyncio.gather() them.
+    """
+    async with models.AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
+
+def _match_name(rows: list, name: str, name_of) -> Optional[Any]:
+    """The row whose name is `name` (ignoring case), else the first whose name contains it"""
+    needle = name.lower()
+    matches = [row for row in rows if needle in name_of(row).lower()]
+    return next((row for row in matches if name_of(row).lower() == needle), matches[0] if matches else None)
+
+
+def _attach(db: Session, row):
+    """Add a row loaded on a lookup session to `db` without selecting it again"""
+    if row is None:
+        return None
+    # An earlier action may already have loaded (and changed) the same row
+    existing = db.identity_map.get(inspect(row).identity_key)
+    return existing if existing is not None else db.merge(row, load=False)
+
+
 class ActionProcessor:
     """Execute all structured actions from LLM response"""
     
@@ -71,7 +98,28 @@ class ActionProcessor:
         database_changes = {}
         
         try:
-            # Process in parallel where possible
+            # Lookup phase: one query per entity type for every name the habit
+            # and people actions mention, run concurrently before anything is
+            # written on `db`. The handlers match names against these lists.
+            habit_names = [
+                (habit_action.new_habit_details or {}).get('name', habit_action.habit_identifier)
+                if habit_action.action_type == 'create_new' else habit_action.habit_identifier
+                for habit_action in response.habit_actions
+            ]
+            person_names = [person_update.person_name for person_update in response.people_updates]
+            lookups = [
+                self._lookup_commitments(habit_names, user_id),
+                self._lookup_people(person_names, user_id)
+            ]
+            if response.mood_analysis:
+                lookups.append(self._lookup_today_checkin(user_id))
+            commitment_rows, person_rows, *checkins = await asyncio.gather(*lookups)
+            today_checkin = checkins[0] if checkins else None
+            # These lists also hold the session's references to the attached rows
+            commitments = [_attach(db, row) for row in commitment_rows]
+            people = [_attach(db, row) for row in person_rows]
+            
+            # Mutate phase: apply the actions in order on the one session
             tasks = []
             
             # 1. Handle commitments
@@ -80,11 +128,11 @@ class ActionProcessor:
             
             # 2. Handle habit actions  
             for habit_action in response.habit_actions:
-                tasks.append(self._process_habit_action(habit_action, user_id, db))
+                tasks.append(self._process_habit_action(habit_action, user_id, db, commitments))
             
             # 3. Handle people updates
             for person_update in response.people_updates:
-                tasks.append(self._update_person(person_update, user_id, db))
+                tasks.append(self._update_person(person_update, user_id, db, people))
             
             # 4. Handle user profile updates
             for profile_update in response.user_profile_updates:
@@ -92,7 +140,7 @@ class ActionProcessor:
             
             # 5. Process mood if detected
             if response.mood_analysis:
-                tasks.append(self._process_mood(response.mood_analysis, user_id, db))
+                tasks.append(self._process_mood(response.mood_analysis, user_id, db, _attach(db, today_checkin)))
             
             # Execute database tasks sequentially (to avoid conflicts)
             for task in tasks:
@@ -169,6 +217,37 @@ class ActionProcessor:
         
         return results
     
+    async def _lookup_commitments(self, names: List[str], user_id: int) -> List[models.Commitment]:
+        """Active recurring commitments whose description contains any of `names`"""
+        if not names:
+            return []
+        description = func.lower(models.Commitment.task_description)
+        return await _fetch_all(select(models.Commitment).where(
+            models.Commitment.user_id == user_id,
+            models.Commitment.recurrence_pattern != "none",
+            models.Commitment.status == "active",
+            or_(*[description.contains(name.lower()) for name in set(names)])
+        ).order_by(models.Commitment.id))
+    
+    async def _lookup_people(self, names: List[str], user_id: int) -> List[models.Person]:
+        """The user's people whose name contains any of `names`"""
+        if not names:
+            return []
+        name = func.lower(models.Person.name)
+        return await _fetch_all(select(models.Person).where(
+            models.Person.user_id == user_id,
+            or_(*[name.contains(person_name.lower()) for person_name in set(names)])
+        ).order_by(models.Person.id))
+    
+    async def _lookup_today_checkin(self, user_id: int) -> Optional[models.DailyCheckIn]:
+        """Find the user's check-in for today, if any"""
+        today = time_service.now().date()
+        checkins = await _fetch_all(select(models.DailyCheckIn).where(
+            models.DailyCheckIn.user_id == user_id,
+            func.date(models.DailyCheckIn.timestamp) == today
+        ).limit(1))
+        return checkins[0] if checkins else None
+    
     def _is_content_duplicate(self, existing_description: str, new_content: str) -> bool:
         """Check if new content already exists in the description"""
         if not existing_description:
@@ -261,16 +340,17 @@ class ActionProcessor:
         self,
         habit_action: HabitAction,
         user_id: int,
-        db: Session
+        db: Session,
+        commitments: List[models.Commitment]
     ) -> Dict[str, Any]:
         """Process a habit-related action - now converted to commitment actions in unified system"""
         try:
             if habit_action.action_type == 'log_completion':
-                return await self._log_commitment_completion(habit_action, user_id, db)
+                return await self._log_commitment_completion(habit_action, user_id, db, commitments)
             elif habit_action.action_type == 'create_new':
-                return await self._create_new_recurring_commitment(habit_action, user_id, db)
+                return await self._create_new_recurring_commitment(habit_action, user_id, db, commitments)
             elif habit_action.action_type == 'update_schedule':
-                return await self._update_commitment_schedule(habit_action, user_id, db)
+                return await self._update_commitment_schedule(habit_action, user_id, db, commitments)
             else:
                 return {
                     'success': False,
@@ -290,16 +370,12 @@ class ActionProcessor:
         self,
         habit_action: HabitAction,
         user_id: int,
-        db: Session
+        db: Session,
+        commitments: List[models.Commitment]
     ) -> Dict[str, Any]:
         """Log a commitment completion (formerly habit completion) in unified system"""
-        # Find existing recurring commitment
-        commitment = db.query(models.Commitment).filter(
-            models.Commitment.user_id == user_id,
-            models.Commitment.task_description.ilike(f"%{habit_action.habit_identifier}%"),
-            models.Commitment.recurrence_pattern != "none",
-            models.Commitment.status == "active"
-        ).first()
+        # Find existing recurring commitment among those looked up
+        commitment = _match_name(commitments, habit_action.habit_identifier, lambda row: row.task_description)
         
         if commitment:
             debug_logger.info(f"🔍 Found similar recurring commitment: '{habit_action.habit_identifier}' -> '{commitment.task_description}' (ID: {commitment.id})")
@@ -326,6 +402,7 @@ class ActionProcessor:
                 
                 db.add(commitment)
                 db.flush()  # Get the ID for logging
+                commitments.append(commitment)
                 
                 debug_logger.info(f"✅ Auto-created recurring commitment: {commitment.task_description} (ID: {commitment.id})")
                 
@@ -365,9 +442,7 @@ class ActionProcessor:
         
         db.add(completion_record)
         
-        # Update commitment stats
-        commitment.completion_count += 1
-        commitment.last_completed_at = time_service.now()
+        # completion_count / last_completed_at are bumped by the completions trigger
         
         # Create description based on whether commitment was auto-created
         if was_auto_created:
@@ -394,7 +469,8 @@ class ActionProcessor:
         self,
         habit_action: HabitAction,
         user_id: int,
-        db: Session
+        db: Session,
+        commitments: List[models.Commitment]
     ) -> Dict[str, Any]:
         """Create a new recurring commitment (formerly habit creation)"""
         if not habit_action.new_habit_details:
@@ -408,12 +484,7 @@ class ActionProcessor:
         commitment_name = details.get('name', habit_action.habit_identifier)
         
         # Check if recurring commitment already exists
-        existing = db.query(models.Commitment).filter(
-            models.Commitment.user_id == user_id,
-            models.Commitment.task_description.ilike(commitment_name),
-            models.Commitment.recurrence_pattern != "none",
-            models.Commitment.status == "active"
-        ).first()
+        existing = any(row.task_description.lower() == commitment_name.lower() for row in commitments)
         
         if existing:
             return {
@@ -458,16 +529,12 @@ class ActionProcessor:
         self,
         habit_action: HabitAction,
         user_id: int,
-        db: Session
+        db: Session,
+        commitments: List[models.Commitment]
     ) -> Dict[str, Any]:
         """Update recurring commitment schedule/settings (formerly habit update)"""
-        # Find the recurring commitment
-        commitment = db.query(models.Commitment).filter(
-            models.Commitment.user_id == user_id,
-            models.Commitment.task_description.ilike(f"%{habit_action.habit_identifier}%"),
-            models.Commitment.recurrence_pattern != "none",
-            models.Commitment.status == "active"
-        ).first()
+        # Find the recurring commitment among those looked up
+        commitment = _match_name(commitments, habit_action.habit_identifier, lambda row: row.task_description)
         
         if not commitment:
             return {
@@ -573,15 +640,13 @@ class ActionProcessor:
         self,
         person_update: AIPersonUpdate,
         user_id: int,
-        db: Session
+        db: Session,
+        people: List[models.Person]
     ) -> Dict[str, Any]:
         """Update or create person information"""
         try:
-            # Find existing person
-            person = db.query(models.Person).filter(
-                models.Person.user_id == user_id,
-                models.Person.name.ilike(f"%{person_update.person_name}%")
-            ).first()
+            # Find existing person among those looked up
+            person = _match_name(people, person_update.person_name, lambda row: row.name)
             
             if person_update.update_type == 'create_new' or not person:
                 # Create new person
@@ -655,7 +720,8 @@ class ActionProcessor:
         self,
         mood_analysis: MoodAnalysis,
         user_id: int,
-        db: Session
+        db: Session,
+        existing_checkin: Optional[models.DailyCheckIn] = None
     ) -> Dict[str, Any]:
         """Process mood analysis and create check-in if appropriate"""
         try:
@@ -670,13 +736,7 @@ class ActionProcessor:
             
             mood_score = mood_scale.get(mood_analysis.detected_mood, 3)
             
-            # Check if user already has a check-in today
-            today = time_service.now().date()
-            existing_checkin = db.query(models.DailyCheckIn).filter(
-                models.DailyCheckIn.user_id == user_id,
-                func.date(models.DailyCheckIn.timestamp) == today
-            ).first()
-            
+            # existing_checkin is today's check-in from the lookup phase (None if there isn't one yet)
             if existing_checkin:
                 # Update existing check-in
                 existing_checkin.mood = mood_score
@@ -7,9 +7,10 @@ import json
 import logging
 import os
 import time
+import orjson
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from schemas.ai_responses import (
     MessageIntent, StructuredAIResponse, ExtractedCommitment,
     ReminderStrategy, HabitAction, MoodAnalysis, ResponseMetadata,
@@ -24,7 +25,7 @@ logger = logging.getLogger(__name__)
 class HybridLLMProcessor:
     """Process messages with structured output guarantees"""
     
-    def __init__(self, anthropic_client: Optional[Anthropic] = None):
+    def __init__(self, anthropic_client: Optional[AsyncAnthropic] = None):
         self.anthropic_client = anthropic_client
         self.system_prompt = self._build_system_prompt()
     
@@ -134,7 +135,7 @@ CONTENT GUIDELINES:
 
 Your output must be parseable JSON that validates against this exact schema."""
     
-    def process_message(
+    async def process_message(
         self,
         message: str,
         intent: MessageIntent,
@@ -175,7 +176,7 @@ Your output must be parseable JSON that validates against this exact schema."""
         try:
             # Call Anthropic API
             api_start_time = time.time()
-            response = self.anthropic_client.messages.create(
+            response = await self.anthropic_client.messages.create(
                 model="claude-3-haiku-20240307",
                 max_tokens=1000,
                 system=self.system_prompt,
@@ -203,14 +204,14 @@ Your output must be parseable JSON that validates against this exact schema."""
             
             # Try to parse as JSON
             try:
-                # First try direct JSON parsing
-                response_data = json.loads(response_text)
+                # First try direct JSON parsing (orjson.JSONDecodeError subclasses json's)
+                response_data = orjson.loads(response_text)
             except json.JSONDecodeError:
                 # If that fails, try to extract JSON from markdown code blocks
                 json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', response_text, re.DOTALL)
                 if json_match:
                     try:
-                        response_data = json.loads(json_match.group(1))
+                        response_data = orjson.loads(json_match.group(1))
                     except json.JSONDecodeError:
                         raise
                 else:
@@ -847,7 +848,7 @@ Your output must be parseable JSON that validates against this exact schema."""
         except:
             return False
     
-    def generate_session_name(self, messages: list) -> str:
+    async def generate_session_name(self, messages: list) -> str:
         """Generate a session name based on the first few messages"""
         if not messages or len(messages) == 0:
             return "New Chat"
@@ -898,7 +899,7 @@ Respond with ONLY the title, no additional text or punctuation."""
                 else:
                     return "General Chat"
             
-            response = self.anthropic_client.messages.create(
+            response = await self.anthropic_client.messages.create(
                 model="claude-3-haiku-20240307",
                 max_tokens=50,
                 messages=[{"role": "user", "content": prompt}]
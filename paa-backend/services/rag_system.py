@@ -5,10 +5,11 @@ Combines semantic search with SQL queries for comprehensive context retrieval.
 
 import os
 import time
-from typing import Dict, List, Any, Optional
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
+from sqlalchemy import func, desc, Date
+from datetime import date, datetime, timedelta
 
 from schemas.ai_responses import MessageIntent, EnhancedContext
 import database as models
@@ -450,31 +451,40 @@ class HybridRAGSystem:
             models.Habit.is_active == 1
         ).all()
         
+        if not habits:
+            return habit_context
+        
         today = time_service.now().date()
+        habit_ids = [habit.id for habit in habits]
+        
+        # Distinct completion days per habit, for completed_today and streaks
+        completion_days = defaultdict(set)
+        for habit_id, day in db.query(
+            models.HabitLog.habit_id,
+            func.date(models.HabitLog.completed_at, type_=Date)
+        ).filter(
+            models.HabitLog.habit_id.in_(habit_ids)
+        ).distinct():
+            completion_days[habit_id].add(day)
+        
+        # Get recent completion rate
+        week_ago = today - timedelta(days=7)
+        recent_completions = dict(db.query(
+            models.HabitLog.habit_id,
+            func.count(models.HabitLog.id)
+        ).filter(
+            models.HabitLog.habit_id.in_(habit_ids),
+            func.date(models.HabitLog.completed_at) >= week_ago
+        ).group_by(models.HabitLog.habit_id).all())
         
         for habit in habits:
-            # Check if completed today
-            completed_today = db.query(models.HabitLog).filter(
-                models.HabitLog.habit_id == habit.id,
-                func.date(models.HabitLog.completed_at) == today
-            ).first() is not None
-            
-            # Calculate current streak
-            current_streak = self._calculate_habit_streak(db, habit.id)
-            
-            # Get recent completion rate
-            week_ago = today - timedelta(days=7)
-            recent_completions = db.query(models.HabitLog).filter(
-                models.HabitLog.habit_id == habit.id,
-                func.date(models.HabitLog.completed_at) >= week_ago
-            ).count()
-            
+            days = completion_days.get(habit.id, set())
             habit_context[habit.name] = {
                 'id': habit.id,
-                'completed_today': completed_today,
-                'current_streak': current_streak,
+                'completed_today': today in days,
+                'current_streak': self._calculate_habit_streak(days, today),
                 'frequency': habit.frequency,
-                'recent_completions': recent_completions,
+                'recent_completions': recent_completions.get(habit.id, 0),
                 'reminder_time': habit.reminder_time,
                 'created_at': habit.created_at.isoformat()
             }
@@ -593,31 +603,11 @@ class HybridRAGSystem:
         
         return temporal_context
     
-    def _calculate_habit_streak(self, db: Session, habit_id: int) -> int:
-        """Calculate current streak for a habit"""
-        # Get all completions for this habit, ordered by date
-        completions = db.query(models.HabitLog).filter(
-            models.HabitLog.habit_id == habit_id
-        ).order_by(desc(models.HabitLog.completed_at)).all()
-        
-        if not completions:
-            return 0
-        
-        # Calculate streak from most recent completion
+    def _calculate_habit_streak(self, completion_days: Set[date], today: date) -> int:
+        """Calculate current streak for a habit: consecutive completion days ending today"""
         streak = 0
-        current_date = time_service.now().date()
-        
-        # Convert completions to dates
-        completion_dates = [comp.completed_at.date() for comp in completions]
-        completion_dates = sorted(set(completion_dates), reverse=True)  # Remove duplicates and sort
-        
-        for date in completion_dates:
-            expected_date = current_date - timedelta(days=streak)
-            if date == expected_date:
-                streak += 1
-            else:
-                break
-        
+        while today - timedelta(days=streak) in completion_days:
+            streak += 1
         return streak
 
 
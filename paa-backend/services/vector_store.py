@@ -329,6 +329,15 @@ class VectorStore:
             print(f"Error searching commitments: {e}")
             return []
     
+    def delete_conversations(self, conversation_ids: List[int]):
+        """Remove conversations from the vector store in a single call"""
+        if not conversation_ids:
+            return
+        try:
+            self.conversations_collection.delete(ids=[f"conv_{conv_id}" for conv_id in conversation_ids])
+        except Exception as e:
+            print(f"Error deleting conversations from vector store: {e}")
+    
     def batch_embed_existing_data(self, db: Session):
         """Embed all existing data from the database"""
         print("Starting batch embedding of existing data...")
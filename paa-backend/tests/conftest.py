@@ -0,0 +1,47 @@
+"""Shared fixtures for the backend tests (run `python -m pytest` from paa-backend).
+
+The app is pointed at a throwaway SQLite database before anything imports
+database.py, and the schema (indexes, triggers) is created with init_db().
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="paa-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("PAA_INIT_SCHEMA", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+database.init_db()
+
+import main  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the schedulers aren't started
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def user(client, db):
+    """A freshly registered user: (User row, auth headers)"""
+    username = f"user-{uuid.uuid4().hex[:8]}"
+    client.post("/register", json={"username": username, "email": f"{username}@example.com", "password": "secret"})
+    token = client.post("/token", data={"username": username, "password": "secret"}).json()["access_token"]
+    return db.query(database.User).filter(database.User.username == username).one(), {"Authorization": f"Bearer {token}"}
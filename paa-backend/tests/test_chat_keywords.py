@@ -0,0 +1,30 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("message, actions", [
+    ("done!", {"complete"}),
+    ("yes, just did it", {"complete"}),
+    ("i cancelled it", {"dismiss"}),
+    ("skipped it, forget it", {"dismiss"}),
+    ("i'm skipping this one", {"dismiss"}),
+    ("postponed to next week", {"postpone"}),
+    ("delayed, maybe tomorrow", {"postpone"}),
+    ("not today", {"postpone"}),
+    # Whole words only
+    ("my eyes hurt", set()),
+    ("the project was abandoned", set()),
+])
+def test_reply_actions(message, actions):
+    assert main._reply_actions(message) == actions
+
+
+@pytest.mark.parametrize("message, topics", [
+    ("i've been tracking my progress", {"habit"}),
+    ("feeling great", {"mood"}),
+    ("what can you do? help", {"help"}),
+    ("hello", set()),
+])
+def test_demo_topics_match_substrings(message, topics):
+    assert {match.lastgroup for match in main._DEMO_TOPIC_RE.finditer(message)} == topics
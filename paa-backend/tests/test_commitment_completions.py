@@ -0,0 +1,81 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import database
+
+
+@pytest.fixture
+def recurring(client, user):
+    """A daily commitment: (commitment id, auth headers)"""
+    _, headers = user
+    response = client.post(
+        "/commitments", json={"task_description": "stretch", "recurrence_pattern": "daily"}, headers=headers
+    )
+    return response.json()["id"], headers
+
+
+def stats(db, commitment_id):
+    db.expire_all()
+    commitment = db.get(database.Commitment, commitment_id)
+    return commitment.completion_count, commitment.last_completed_at
+
+
+def test_triggers_track_completion_count(db, user, recurring):
+    commitment_id, _ = recurring
+    owner, _ = user
+    completed_at = datetime(2026, 3, 2, 8, 0)
+    rows = [
+        database.CommitmentCompletion(
+            commitment_id=commitment_id, user_id=owner.id, completion_date=date(2026, 3, day),
+            completed_at=completed_at, skipped=skipped
+        )
+        for day, skipped in ((1, False), (2, False), (3, True))
+    ]
+    db.add_all(rows)
+    db.commit()
+    # Skipped days don't count as completions
+    assert stats(db, commitment_id) == (2, completed_at)
+
+    db.delete(rows[0])
+    db.delete(rows[2])
+    db.commit()
+    assert stats(db, commitment_id)[0] == 1
+
+
+def test_duplicate_completion_is_ignored(client, db, recurring):
+    commitment_id, headers = recurring
+    body = {"completion_date": "2026-03-04"}
+    first = client.post(f"/commitments/{commitment_id}/complete", json=body, headers=headers)
+    second = client.post(f"/commitments/{commitment_id}/complete", json=body, headers=headers)
+    assert first.json() == {"message": "Recurring commitment completed for 2026-03-04"}
+    assert second.json() == {"message": "Commitment already completed for 2026-03-04"}
+
+    completions = db.query(database.CommitmentCompletion).filter(
+        database.CommitmentCompletion.commitment_id == commitment_id
+    ).all()
+    assert len(completions) == 1
+    assert stats(db, commitment_id)[0] == 1
+
+
+def test_duplicate_completions_removed_before_unique_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE commitment_completions (id INTEGER PRIMARY KEY, commitment_id INTEGER, completion_date DATE)"
+        )
+        connection.execute(
+            text("INSERT INTO commitment_completions (commitment_id, completion_date) VALUES (:commitment_id, :day)"),
+            [
+                {"commitment_id": 1, "day": "2026-03-01"},
+                {"commitment_id": 1, "day": "2026-03-01"},
+                {"commitment_id": 1, "day": "2026-03-02"},
+                {"commitment_id": 2, "day": "2026-03-01"},
+                {"commitment_id": 1, "day": "2026-03-01"},
+            ]
+        )
+        connection.exec_driver_sql(database.DEDUPE_COMMITMENT_COMPLETIONS)
+        remaining = connection.exec_driver_sql("SELECT id FROM commitment_completions ORDER BY id").scalars().all()
+    # The lowest id of each (commitment_id, completion_date) is kept
+    assert remaining == [1, 3, 4]
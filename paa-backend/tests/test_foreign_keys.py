@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import delete
+
+import database
+
+
+@pytest.fixture
+def chat_session(client, user):
+    """A session with two conversations, one of which a commitment was created from"""
+    owner, headers = user
+    session_id = client.post("/sessions", json={"name": "Errands"}, headers=headers).json()["id"]
+    with database.SessionLocal() as db:
+        conversations = [
+            database.Conversation(
+                user_id=owner.id, session_id=session_id, session_name="Errands", message=message, response="ok"
+            )
+            for message in ("buy milk", "call mum")
+        ]
+        db.add_all(conversations)
+        db.flush()
+        commitment = database.Commitment(
+            user_id=owner.id, task_description="buy milk", recurrence_pattern="none",
+            created_from_conversation_id=conversations[0].id
+        )
+        db.add(commitment)
+        db.commit()
+        return session_id, commitment.id, headers
+
+
+def test_foreign_keys_enforced(db):
+    assert db.connection().exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+
+def test_session_delete_cascades_to_conversations(db, chat_session):
+    session_id, commitment_id, _ = chat_session
+    db.execute(delete(database.ChatSession).where(database.ChatSession.id == session_id))
+    db.commit()
+
+    assert db.query(database.Conversation).filter(database.Conversation.session_id == session_id).count() == 0
+    assert db.get(database.Commitment, commitment_id).created_from_conversation_id is None
+
+
+def test_delete_session_endpoint(client, db, chat_session):
+    session_id, commitment_id, headers = chat_session
+    response = client.delete(f"/sessions/{session_id}", headers=headers)
+    assert response.status_code == 200
+
+    assert db.get(database.ChatSession, session_id) is None
+    assert db.query(database.Conversation).filter(database.Conversation.session_id == session_id).count() == 0
+    assert db.get(database.Commitment, commitment_id).created_from_conversation_id is None
+    assert client.delete(f"/sessions/{session_id}", headers=headers).status_code == 404
+
+
+def test_delete_commitment_endpoint(client, db, user, chat_session):
+    owner, _ = user
+    _, commitment_id, headers = chat_session
+    message = database.ProactiveMessage(
+        user_id=owner.id, content="How did it go?", message_type="commitment_reminder",
+        related_commitment_id=commitment_id
+    )
+    completion = database.CommitmentCompletion(
+        commitment_id=commitment_id, user_id=owner.id, completion_date=date(2026, 3, 1), skipped=False
+    )
+    db.add_all([message, completion])
+    db.commit()
+    message_id, completion_id = message.id, completion.id
+
+    response = client.delete(f"/commitments/{commitment_id}", headers=headers)
+    assert response.status_code == 200
+
+    db.expire_all()
+    assert db.get(database.Commitment, commitment_id) is None
+    assert db.get(database.CommitmentCompletion, completion_id) is None
+    # The reminder history stays, unlinked from the deleted commitment
+    assert db.get(database.ProactiveMessage, message_id).related_commitment_id is None
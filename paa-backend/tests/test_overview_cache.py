@@ -0,0 +1,39 @@
+from datetime import date, datetime, time
+
+import main
+
+
+def overview(client, headers):
+    return client.get("/analytics/overview", headers=headers).json()
+
+
+def test_writes_drop_cached_overview(client, user):
+    _, headers = user
+    assert overview(client, headers)["total_commitments"] == 0
+
+    response = client.post(
+        "/commitments", json={"task_description": "stretch", "recurrence_pattern": "daily"}, headers=headers
+    )
+    commitment_id = response.json()["id"]
+    assert overview(client, headers)["total_commitments"] == 1
+
+    client.post(f"/commitments/{commitment_id}/complete", headers=headers)
+    assert overview(client, headers)["completed_today"] == 1
+
+    client.delete(f"/commitments/{commitment_id}", headers=headers)
+    assert overview(client, headers)["total_commitments"] == 0
+
+
+def test_streak_follows_service_time(monkeypatch, client, user):
+    _, headers = user
+    response = client.post(
+        "/commitments", json={"task_description": "read", "recurrence_pattern": "daily"}, headers=headers
+    )
+    commitment_id = response.json()["id"]
+    days = [date(2024, 3, day) for day in (1, 2, 3)]
+    for day in days:
+        client.post(f"/commitments/{commitment_id}/complete", json={"completion_date": str(day)}, headers=headers)
+
+    # Under fake time the streak window ends on the service's today, not the wall clock's
+    monkeypatch.setattr(main.time_service, "now", lambda: datetime.combine(days[-1], time(12, 0)))
+    assert overview(client, headers)["longest_streak"] == 3
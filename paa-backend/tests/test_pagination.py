@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta
+from urllib.parse import quote
+
+import pytest
+from fastapi import HTTPException
+
+import database
+import main
+
+
+def walk(client, headers, url):
+    """Ids across every page of `url`, following X-Next-Cursor"""
+    ids, cursor = [], None
+    while True:
+        separator = "&" if "?" in url else "?"
+        response = client.get(url + (f"{separator}cursor={quote(cursor)}" if cursor else ""), headers=headers)
+        assert response.status_code == 200, response.text
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("value, column", [
+    (date(2026, 3, 1), database.Commitment.deadline),
+    (datetime(2026, 3, 1, 9, 30), database.Commitment.created_at),
+    (4, database.Commitment.completion_count),
+    (None, database.Commitment.deadline),
+    ("ignored", None),
+])
+def test_cursor_round_trip(value, column):
+    encoded = value.isoformat() if isinstance(value, (date, datetime)) else value
+    assert main._decode_cursor(main._encode_cursor(encoded, 7), column) == (value, 7)
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        main._decode_cursor("not-a-cursor", database.Commitment.deadline)
+    assert error.value.status_code == 400
+
+
+@pytest.fixture
+def commitments(client, user):
+    _, headers = user
+    for i in range(7):
+        body = {"task_description": f"task {i}", "recurrence_pattern": "none"}
+        # Some deadlines tie and some are NULL, so the id tiebreak and NULLS LAST matter
+        if i % 3:
+            body["deadline"] = str(date.today() + timedelta(days=i % 2))
+        assert client.post("/commitments", json=body, headers=headers).status_code == 200
+    return headers
+
+
+def test_commitments_unpaged_by_default(client, commitments):
+    response = client.get("/commitments", headers=commitments)
+    assert len(response.json()) == 7
+    assert "x-next-cursor" not in response.headers
+
+
+@pytest.mark.parametrize("sort_by", ["deadline", "created_at", "completion_count"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_commitment_pages_follow_cursor(client, commitments, sort_by, order):
+    url = f"/commitments?sort_by={sort_by}&order={order}"
+    everything = [row["id"] for row in client.get(url, headers=commitments).json()]
+    first_page = client.get(url + "&limit=3", headers=commitments)
+    assert len(first_page.json()) == 3
+    assert first_page.headers["x-next-cursor"]
+    assert walk(client, commitments, url + "&limit=3") == everything
+
+
+def test_session_pages_follow_cursor(client, user):
+    _, headers = user
+    for i in range(5):
+        client.post("/sessions", json={"name": f"session {i}"}, headers=headers)
+    everything = [row["id"] for row in client.get("/sessions", headers=headers).json()]
+    assert len(everything) == 5
+    assert walk(client, headers, "/sessions?limit=2") == everything
+    assert client.get("/sessions?cursor=zzz", headers=headers).status_code == 400
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import database
+import scheduler
+
+
+class FixedClock:
+    def __init__(self, now: datetime):
+        self.current = now
+
+    def now(self) -> datetime:
+        return self.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fixed = FixedClock(datetime.now().replace(microsecond=0))
+    monkeypatch.setattr(scheduler, "get_time_service", lambda: fixed)
+    return fixed
+
+
+@pytest.mark.parametrize("after, expected", [
+    # Monday 2026-03-02, inside the send window
+    (datetime(2026, 3, 2, 17, 4), datetime(2026, 3, 2, 17, 0)),
+    # Window closed: next weekday
+    (datetime(2026, 3, 2, 17, 6), datetime(2026, 3, 3, 17, 0)),
+    # Friday evening rolls over the weekend
+    (datetime(2026, 3, 6, 18, 0), datetime(2026, 3, 9, 17, 0)),
+])
+def test_next_prompt_due_at(after, expected):
+    weekdays = "monday, Tuesday,wednesday,thursday,friday"
+    assert scheduler.next_prompt_due_at(time(17, 0), weekdays, after) == expected
+
+
+def test_next_prompt_due_at_without_days():
+    assert scheduler.next_prompt_due_at(time(17, 0), "", datetime(2026, 3, 2)) is None
+
+
+@pytest.mark.parametrize("query", [scheduler.overdue_commitments_query, scheduler.due_prompts_query])
+def test_job_queries_skip_locked_rows(query):
+    sql = str(query(datetime(2026, 3, 2)).compile(dialect=postgresql.dialect()))
+    assert sql.endswith("FOR UPDATE SKIP LOCKED")
+
+
+def reminders(db, user_id):
+    db.expire_all()
+    return db.query(database.ProactiveMessage).filter(
+        database.ProactiveMessage.user_id == user_id,
+        database.ProactiveMessage.message_type == "commitment_reminder"
+    ).all()
+
+
+def test_commitment_reminders_in_batches(monkeypatch, clock, db, user):
+    owner, _ = user
+    commitments = [
+        database.Commitment(
+            user_id=owner.id, task_description=f"task {i}", recurrence_pattern="none", status="pending",
+            deadline=date.today() - timedelta(days=1), reminder_count=0
+        )
+        for i in range(5)
+    ]
+    db.add_all(commitments)
+    db.commit()
+    commitment_ids = {commitment.id for commitment in commitments}
+
+    batch_sizes = []
+    send = scheduler.send_proactive_messages
+    def record_batch(session, messages, sent_at):
+        batch_sizes.append(len(messages))
+        send(session, messages, sent_at)
+    monkeypatch.setattr(scheduler, "send_proactive_messages", record_batch)
+    monkeypatch.setattr(scheduler, "REMINDER_BATCH_SIZE", 2)
+
+    asyncio.run(scheduler.check_commitment_reminders())
+    sent = reminders(db, owner.id)
+    assert {message.related_commitment_id for message in sent} == commitment_ids
+    assert len(sent) == 5
+    assert batch_sizes and max(batch_sizes) <= 2
+    assert {message.sent_at for message in sent} == {clock.current}
+    for commitment in commitments:
+        db.refresh(commitment)
+        assert (commitment.reminder_count, commitment.last_reminded_at) == (1, clock.current)
+
+    # Too soon for another reminder
+    asyncio.run(scheduler.check_commitment_reminders())
+    assert len(reminders(db, owner.id)) == 5
+
+    # The second (and last) reminder
+    clock.current += timedelta(minutes=31)
+    asyncio.run(scheduler.check_commitment_reminders())
+    sent = reminders(db, owner.id)
+    assert len(sent) == 10
+    assert sum(message.content.startswith("Looks like") for message in sent) == 5
+
+    clock.current += timedelta(minutes=31)
+    asyncio.run(scheduler.check_commitment_reminders())
+    assert len(reminders(db, owner.id)) == 10
+
+
+def test_scheduled_prompt_sent_once(clock, db, user):
+    owner, _ = user
+    # A Monday comfortably after the prompts seeded at registration came due
+    monday = date.today() + timedelta(days=7)
+    monday += timedelta(days=-monday.weekday() % 7)
+    clock.current = datetime.combine(monday, time(17, 2))
+
+    for _ in range(2):
+        asyncio.run(scheduler.send_scheduled_prompts())
+
+    db.expire_all()
+    sent = db.query(database.ProactiveMessage).filter(
+        database.ProactiveMessage.user_id == owner.id,
+        database.ProactiveMessage.message_type == "scheduled_prompt"
+    ).all()
+    assert [message.content for message in sent] == [scheduler.DEFAULT_WORK_CHECKIN["prompt_template"]]
+
+    work_checkin = db.query(database.ScheduledPrompt).filter(
+        database.ScheduledPrompt.user_id == owner.id,
+        database.ScheduledPrompt.prompt_type == "work_checkin"
+    ).one()
+    assert work_checkin.last_sent_at == clock.current
+    assert work_checkin.next_due_at == datetime.combine(monday + timedelta(days=1), time(17, 0))
+
+
+def test_send_proactive_message(clock, db, user):
+    owner, _ = user
+
+    async def send():
+        async with database.AsyncSessionLocal() as session:
+            await scheduler.send_proactive_message(session, owner.id, "Checking in!", "escalation")
+
+    asyncio.run(send())
+    sent = db.query(database.ProactiveMessage).filter(
+        database.ProactiveMessage.user_id == owner.id,
+        database.ProactiveMessage.message_type == "escalation"
+    ).one()
+    assert (sent.content, sent.sent_at) == ("Checking in!", clock.current)
@@ -76,7 +76,7 @@ trap cleanup SIGINT SIGTERM
 echo "📡 Starting Backend Server (FastAPI)..."
 cd paa-backend
 source venv/bin/activate &
-(source venv/bin/activate && uvicorn main:app --host 0.0.0.0 --port 8000 --reload) &
+(source venv/bin/activate && python scripts/init_db.py && uvicorn main:app --host 0.0.0.0 --port 8000 --reload) &
 BACKEND_PID=$!
 cd ..
 